@@ -0,0 +1,142 @@
+# Copyright (C) Muhammad Essam Abelaziz | Saturday 28 October
+#
+# If you intend to use, modify, or redistribute this code for educational purposes, you are required to
+# provide attribution by prominently displaying the following information in your project:
+#
+# Original code by Muhammad Essam Abdelaziz
+# git@github.com:Coderation/Tic-Tac-Toe-Project-with-6-Uniform-Search-Methods-for-ILLUSTRATIVE-PURPOSES.git
+
+#_________________________________________________________________________________________________________#
+
+# This module evaluates many boards at once with NumPy, for offline analysis of large numbers of positions.
+# Boards are rows of an (N, 9) int8 array holding EMPTY, X or O for each cell.
+# Every row is first packed into two 9-bit bitboards, and everything else is a handful of lookups in 512-entry tables,
+# done for all rows at the same time instead of one board at a time in Python.
+from collections import namedtuple
+
+import numpy as np
+
+from engine import FULL_MASK, WINNING
+
+# These are the cell values used in the board arrays.
+EMPTY, X, O = 0, 1, 2
+
+# WINNING_TABLE[bits] is True when the bitboard bits completes a line (the engine's WINNING table as an array).
+WINNING_TABLE = np.array(WINNING, dtype=bool)
+# WINNING_CELLS[bits] is a mask of the cells that would complete a line if a piece was added to the bitboard bits.
+# It ignores whether those cells are free; the callers remove the occupied cells afterwards.
+WINNING_CELLS = np.array([sum(1 << cell for cell in range(9) if WINNING[bits | 1 << cell]) for bits in range(1 << 9)],
+                         dtype=np.uint16)
+# LOWEST_CELL[mask] and HIGHEST_CELL[mask] are the lowest and highest cells in a mask, or -1 for an empty mask.
+LOWEST_CELL = np.array([(mask & -mask).bit_length() - 1 for mask in range(1 << 9)], dtype=np.int8)
+HIGHEST_CELL = np.array([mask.bit_length() - 1 for mask in range(1 << 9)], dtype=np.int8)
+# CELL_COUNT[mask] is the number of cells in a mask, and NTH_CELL[mask, n] is the n-th lowest of them.
+CELL_COUNT = np.array([bin(mask).count('1') for mask in range(1 << 9)], dtype=np.int8)
+NTH_CELL = np.full((1 << 9, 9), -1, dtype=np.int8)
+for _mask in range(1 << 9):
+    for _n, _cell in enumerate(cell for cell in range(9) if _mask >> cell & 1):
+        NTH_CELL[_mask, _n] = _cell
+# CELL_BITS is used to unpack masks back into (N, 9) arrays of booleans.
+CELL_BITS = np.arange(9, dtype=np.uint16)
+
+# BatchResult is what evaluate_batch returns. Every field has one entry (or row) per board:
+#   winner          X or O if that player has completed a line, else EMPTY
+#   terminal        True if the game is over (a player has won or the board is full)
+#   winning_moves   (N, 9) booleans, the empty cells where the player to move wins immediately
+#   blocking_moves  (N, 9) booleans, the empty cells where the opponent would win immediately, so the player must block
+#   heuristic_move  the cell the one-ply heuristic of the chosen algorithm would play, or -1 if the board is full
+BatchResult = namedtuple('BatchResult', ['winner', 'terminal', 'winning_moves', 'blocking_moves', 'heuristic_move'])
+
+
+# This function turns a list of boards in the engine's format (nine ' ', 'X' and 'O' cells each) into an (N, 9) int8 array.
+def encode_boards(boards):
+    codes = {' ': EMPTY, 'X': X, 'O': O}
+    return np.array([[codes[cell] for cell in board] for board in boards], dtype=np.int8).reshape(-1, 9)
+
+
+# This function packs every row of an (N, 9) board array into two bitboards and returns them as (x_bits, o_bits).
+def to_bitboards(boards):
+    boards = np.asarray(boards)
+    if boards.ndim != 2 or boards.shape[1] != 9:
+        raise ValueError("boards must have shape (N, 9)")
+    # packbits turns the nine booleans of a row into two bytes, with cell 0 as the lowest bit of the first byte.
+    x_bytes = np.packbits(boards == X, axis=1, bitorder='little').astype(np.uint16)
+    o_bytes = np.packbits(boards == O, axis=1, bitorder='little').astype(np.uint16)
+    return x_bytes[:, 0] | x_bytes[:, 1] << 8, o_bytes[:, 0] | o_bytes[:, 1] << 8
+
+
+# This function unpacks an array of N cell masks into an (N, 9) array of booleans.
+def unpack_cells(masks):
+    return (masks[:, None] >> CELL_BITS & 1).astype(bool)
+
+
+# This function returns the winner of every board: X or O if that player has completed a line, else EMPTY.
+def winners(boards):
+    x_bits, o_bits = to_bitboards(boards)
+    result = np.full(len(x_bits), EMPTY, dtype=np.int8)
+    result[WINNING_TABLE[o_bits]] = O
+    result[WINNING_TABLE[x_bits]] = X
+    return result
+
+
+# This function returns True for every board whose game is over, because a player has won or the board is full.
+def terminal(boards):
+    x_bits, o_bits = to_bitboards(boards)
+    return WINNING_TABLE[x_bits] | WINNING_TABLE[o_bits] | ((x_bits | o_bits) == FULL_MASK)
+
+
+# This function returns, for every board, the mask of empty cells where the player with bitboard own wins immediately.
+def _winning_cell_masks(own_bits, occupied):
+    return WINNING_CELLS[own_bits] & ~occupied & FULL_MASK
+
+
+# This function returns the (N, 9) booleans of the empty cells where player (X or O) wins immediately.
+# The cells where player must block are winning_moves(boards, opponent).
+def winning_moves(boards, player=O):
+    x_bits, o_bits = to_bitboards(boards)
+    own_bits = o_bits if player == O else x_bits
+    return unpack_cells(_winning_cell_masks(own_bits, x_bits | o_bits))
+
+
+# This function evaluates every board in one set of array operations and returns a BatchResult.
+# player is the player to move (O, like the AIs of the game, by default).
+# algorithm selects the one-ply heuristic for heuristic_move, exactly as the engine's algorithms choose:
+#   'BFS' and 'DFS' play the highest winning cell, else the highest blocking cell, else a random empty cell;
+#   'Bidirectional' plays the lowest winning cell, else the lowest blocking cell, else a random empty cell.
+# The random choices come from a NumPy generator seeded with seed, so a batch can be evaluated again with the same result.
+def evaluate_batch(boards, algorithm='BFS', player=O, seed=None):
+    if algorithm.lower() in ('bfs', 'dfs'):
+        pick = HIGHEST_CELL
+    elif algorithm.lower() == 'bidirectional':
+        pick = LOWEST_CELL
+    else:
+        raise ValueError("Unknown one-ply algorithm: " + str(algorithm))
+    if player not in (X, O):
+        raise ValueError("player must be X or O")
+
+    x_bits, o_bits = to_bitboards(boards)
+    occupied = x_bits | o_bits
+    own_bits, other_bits = (o_bits, x_bits) if player == O else (x_bits, o_bits)
+
+    # Winner and terminal status.
+    x_won = WINNING_TABLE[x_bits]
+    o_won = WINNING_TABLE[o_bits]
+    winner = np.full(len(x_bits), EMPTY, dtype=np.int8)
+    winner[o_won] = O
+    winner[x_won] = X
+    is_terminal = x_won | o_won | (occupied == FULL_MASK)
+
+    # Immediate wins of the player to move and of the opponent (the cells to block).
+    win_masks = _winning_cell_masks(own_bits, occupied)
+    block_masks = _winning_cell_masks(other_bits, occupied)
+
+    # The heuristic move: a winning cell if there is one, else a blocking cell, else a random empty cell.
+    empty_masks = ~occupied & FULL_MASK
+    counts = CELL_COUNT[empty_masks]
+    rng = np.random.default_rng(seed)
+    random_index = (rng.random(len(x_bits)) * np.maximum(counts, 1)).astype(np.intp)
+    move = NTH_CELL[empty_masks, random_index]
+    move = np.where(block_masks != 0, pick[block_masks], move)
+    move = np.where(win_masks != 0, pick[win_masks], move)
+
+    return BatchResult(winner, is_terminal, unpack_cells(win_masks), unpack_cells(block_masks), move)
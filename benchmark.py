@@ -0,0 +1,262 @@
+# Copyright (C) Muhammad Essam Abelaziz | Saturday 28 October
+#
+# If you intend to use, modify, or redistribute this code for educational purposes, you are required to
+# provide attribution by prominently displaying the following information in your project:
+#
+# Original code by Muhammad Essam Abdelaziz
+# git@github.com:Coderation/Tic-Tac-Toe-Project-with-6-Uniform-Search-Methods-for-ILLUSTRATIVE-PURPOSES.git
+
+#_________________________________________________________________________________________________________#
+
+# This module is the benchmark suite of the AI algorithms.
+# Every algorithm is asked for a move in every position of a fixed corpus:
+#   '3x3'     every reachable position of classic Tic-Tac-Toe where the game is not over yet (4520 positions)
+#   'larger'  a few positions of bigger boards, reached by seeded random moves, so the corpus never changes between runs
+# For every algorithm and corpus it records the wall time, the nodes the searches expanded (and nodes per second;
+# for bfs, dfs and bidirectional, which do not search, the nodes are their threat index queries, see Engine.nodes),
+# the peak memory allocated while answering, and the percentiles of the move latency.
+# The results are written as JSON, and a run can be compared with an earlier one: if any algorithm got slower than
+# the threshold allows, the comparison is printed and the run fails with exit status 1.
+#
+# The perfect-play database and the retrograde tables are not used by default (they would answer ucs and iddfs with
+# a lookup instead of a search), and the transposition table is cleared before every algorithm and corpus,
+# so every run starts from the same state.
+#
+# Example:
+#     python benchmark.py --output baseline.json
+#     python benchmark.py --compare baseline.json --threshold 0.10
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from engine import ALGORITHMS, Engine
+from geometry import STANDARD, get_geometry
+from tournament import percentile
+
+# DEFAULT_ALGORITHMS are the algorithms benchmarked when none are named: every search, but not MCTS,
+# which spends its whole playout budget on every move and would take most of the run (ask for it with --algorithms MCTS).
+DEFAULT_ALGORITHMS = [algorithm for algorithm in ALGORITHMS if algorithm != 'MCTS']
+# PERCENTILES are the move latency percentiles reported for every algorithm.
+PERCENTILES = (50, 90, 99)
+
+# LARGER_BOARDS describes the positions of the 'larger' corpus: for each (rows, cols, k), how many positions to
+# generate and how many random moves to play from the empty board to reach each of them.
+LARGER_BOARDS = (
+    ((4, 4, 3), 6, 4),
+    ((4, 4, 4), 4, 4),
+    ((5, 5, 4), 4, 14),
+)
+
+
+# This function returns every reachable 3 x 3 position where the game is not over yet, as (geometry, board, player) tuples.
+# The positions are found by playing every possible game from the empty board, and are sorted so the order never changes.
+def reachable_positions(geometry=STANDARD):
+    seen = set()
+    stack = [(0, 0)]
+    while stack:
+        x_bits, o_bits = stack.pop()
+        if (x_bits, o_bits) in seen:
+            continue
+        seen.add((x_bits, o_bits))
+        # 'X' moves first, so it is 'X' to move whenever both players have the same number of pieces.
+        player = 'X' if bin(x_bits).count('1') == bin(o_bits).count('1') else 'O'
+        for move in geometry.empty_cells(x_bits | o_bits):
+            if player == 'X':
+                child = (x_bits | 1 << move, o_bits)
+            else:
+                child = (x_bits, o_bits | 1 << move)
+            # A move that wins or fills the board ends the game, so the position it leads to is not in the corpus.
+            if not geometry.wins(child[0] if player == 'X' else child[1]) and child[0] | child[1] != geometry.full_mask:
+                stack.append(child)
+    positions = []
+    for x_bits, o_bits in sorted(seen):
+        board = ['X' if x_bits >> i & 1 else 'O' if o_bits >> i & 1 else ' ' for i in range(geometry.cells)]
+        player = 'X' if bin(x_bits).count('1') == bin(o_bits).count('1') else 'O'
+        positions.append((geometry, board, player))
+    return positions
+
+
+# This function returns the positions of the 'larger' corpus, as (geometry, board, player) tuples.
+# Each one is reached by playing random moves, from a Random seeded with seed, that do not end the game.
+def larger_positions(seed=0):
+    rng = random.Random(seed)
+    positions = []
+    for (rows, cols, k), count, moves in LARGER_BOARDS:
+        geometry = get_geometry(rows, cols, k)
+        while count:
+            engine = Engine(geometry=geometry)
+            for _ in range(moves):
+                player = engine.current_player
+                engine.place(rng.choice(engine.empty_cells()))
+                if engine.check_winner(player):
+                    break
+                engine.switch_player()
+            else:
+                positions.append((geometry, engine.board, engine.current_player))
+                count -= 1
+    return positions
+
+
+# This function asks algorithm for a move in every position and returns the latency of every move (in seconds)
+# and the total number of nodes the searches expanded.
+# Every position gets a fresh Engine with its own seeded random generator, so the random fallback moves are reproducible.
+def run_pass(algorithm, positions, seed=0):
+    Engine.table.clear()
+    latencies = []
+    nodes = 0
+    for geometry, board, player in positions:
+        engine = Engine(board, player, geometry)
+        engine.rng = random.Random(seed)
+        start = time.perf_counter()
+        engine.best_move(algorithm)
+        latencies.append(time.perf_counter() - start)
+        nodes += engine.nodes
+    return latencies, nodes
+
+
+# This function benchmarks one algorithm on one corpus and returns its results as a dictionary.
+# The positions are timed repeat times and the fastest pass is kept, which filters out most of the noise of a busy machine.
+# Tracing memory allocations slows Python down a lot, so the peak memory comes from one more, traced pass.
+def measure(algorithm, positions, seed=0, repeat=3):
+    wall = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pass_latencies, nodes = run_pass(algorithm, positions, seed)
+        elapsed = time.perf_counter() - start
+        if wall is None or elapsed < wall:
+            wall, latencies = elapsed, pass_latencies
+
+    tracemalloc.start()
+    try:
+        run_pass(algorithm, positions, seed)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    result = {
+        'positions': len(positions),
+        'seconds': wall,
+        'nodes': nodes,
+        'nodes_per_second': nodes / wall if wall else 0.0,
+        'peak_memory_bytes': peak,
+    }
+    # Latencies are reported in microseconds.
+    for p in PERCENTILES:
+        result['p' + str(p) + '_us'] = percentile(latencies, p) * 1e6
+    result['max_us'] = latencies[-1] * 1e6 if latencies else 0.0
+    return result
+
+
+# This function runs the whole benchmark and returns a summary dictionary.
+#   algorithms    the AI option names to benchmark (DEFAULT_ALGORITHMS by default)
+#   corpora       the corpora to run them on ('3x3' and 'larger' by default)
+#   seed          the seed of the random fallback moves and of the 'larger' corpus
+#   use_database  whether ucs and iddfs may answer from the perfect-play database and the retrograde tables
+#   repeat        how many timed passes every algorithm makes over every corpus (the fastest one is reported)
+def run_benchmark(algorithms=None, corpora=('3x3', 'larger'), seed=0, use_database=False, repeat=3):
+    algorithms = list(algorithms or DEFAULT_ALGORITHMS)
+    for algorithm in algorithms:
+        if algorithm not in ALGORITHMS:
+            raise ValueError("Unknown AI algorithm: " + str(algorithm))
+    builders = {'3x3': reachable_positions, 'larger': lambda: larger_positions(seed)}
+    for corpus in corpora:
+        if corpus not in builders:
+            raise ValueError("Unknown corpus: " + str(corpus))
+    if repeat < 1:
+        raise ValueError("repeat must be at least 1")
+
+    saved_path = Engine.database_path
+    saved_directory = Engine.tables_directory
+    if not use_database:
+        Engine.database_path = None
+        Engine.tables_directory = None
+    try:
+        results = {}
+        for corpus in corpora:
+            positions = builders[corpus]()
+            results[corpus] = {algorithm: measure(algorithm, positions, seed, repeat) for algorithm in algorithms}
+    finally:
+        Engine.database_path = saved_path
+        Engine.tables_directory = saved_directory
+    return {
+        'seed': seed,
+        'use_database': use_database,
+        'repeat': repeat,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+# This function compares a summary with a baseline summary.
+# It returns a list of (corpus, algorithm, baseline seconds, seconds, change) tuples, one for every algorithm and corpus
+# found in both, and a list of the ones whose wall time grew by more than threshold (0.10 means 10%).
+def compare(summary, baseline, threshold=0.10):
+    rows = []
+    slower = []
+    for corpus, algorithms in summary['results'].items():
+        for algorithm, result in algorithms.items():
+            before = baseline.get('results', {}).get(corpus, {}).get(algorithm)
+            if before is None:
+                continue
+            change = result['seconds'] / before['seconds'] - 1 if before['seconds'] else 0.0
+            row = (corpus, algorithm, before['seconds'], result['seconds'], change)
+            rows.append(row)
+            if change > threshold:
+                slower.append(row)
+    return rows, slower
+
+
+# This function prints a benchmark summary as a plain text table.
+def print_summary(summary):
+    columns = ['positions', 'seconds', 'nodes', 'nodes/s', 'peak KiB'] + ['p' + str(p) + ' us' for p in PERCENTILES] + ['max us']
+    cell = 12
+    for corpus, algorithms in summary['results'].items():
+        width = max(len(algorithm) for algorithm in algorithms) + 2
+        print("Corpus " + corpus + ":")
+        print(''.ljust(width) + ''.join(column.rjust(cell) for column in columns))
+        for algorithm, result in algorithms.items():
+            values = [str(result['positions']), '{:.3f}'.format(result['seconds']), str(result['nodes']),
+                      '{:.0f}'.format(result['nodes_per_second']), '{:.1f}'.format(result['peak_memory_bytes'] / 1024)]
+            values += ['{:.1f}'.format(result['p' + str(p) + '_us']) for p in PERCENTILES]
+            values.append('{:.1f}'.format(result['max_us']))
+            print(algorithm.ljust(width) + ''.join(value.rjust(cell) for value in values))
+        print()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the AI algorithms on a fixed corpus of positions.")
+    parser.add_argument('--algorithms', nargs='+', default=DEFAULT_ALGORITHMS, choices=list(ALGORITHMS),
+                        help="algorithms to benchmark (default: all of them but MCTS)")
+    parser.add_argument('--corpora', nargs='+', default=['3x3', 'larger'], choices=['3x3', 'larger'],
+                        help="corpora to run (default: all of them)")
+    parser.add_argument('--seed', type=int, default=0, help="benchmark seed (default: %(default)s)")
+    parser.add_argument('--repeat', type=int, default=3, help="timed passes per algorithm (default: %(default)s)")
+    parser.add_argument('--use-database', action='store_true',
+                        help="let ucs and iddfs answer from the perfect-play database and the retrograde tables")
+    parser.add_argument('--output', metavar='PATH', help="write the results as JSON to PATH")
+    parser.add_argument('--compare', metavar='PATH', help="compare the results with an earlier JSON file")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="slowdown that fails a comparison, as a fraction (default: %(default)s)")
+    args = parser.parse_args()
+
+    summary = run_benchmark(args.algorithms, args.corpora, args.seed, args.use_database, args.repeat)
+    print_summary(summary)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows, slower = compare(summary, baseline, args.threshold)
+        print("Wall time against " + args.compare + ":")
+        for corpus, algorithm, before, after, change in rows:
+            print('  {:8}{:16}{:10.3f} s ->{:8.3f} s  {:+.1%}'.format(corpus, algorithm, before, after, change))
+        if slower:
+            print("{} algorithm(s) slower than the {:.0%} threshold".format(len(slower), args.threshold))
+            sys.exit(1)
@@ -0,0 +1,912 @@
+# Copyright (C) Muhammad Essam Abelaziz | Saturday 28 October
+#
+# If you intend to use, modify, or redistribute this code for educational purposes, you are required to
+# provide attribution by prominently displaying the following information in your project:
+#
+# Original code by Muhammad Essam Abdelaziz
+# git@github.com:Coderation/Tic-Tac-Toe-Project-with-6-Uniform-Search-Methods-for-ILLUSTRATIVE-PURPOSES.git
+
+#_________________________________________________________________________________________________________#
+
+# This module is the game engine: the board, the win checks and the AI algorithms (six searches and MCTS).
+# It does not import tkinter and never opens a window, so the AIs can be used from servers, batch jobs and benchmarks.
+# The Tk game in TikTakToe.py is a thin client on top of it.
+# Boards can be any m x n grid with k in a row to win (see geometry.py); classic 3 x 3 Tic-Tac-Toe is the default.
+import random
+import time
+from collections import namedtuple
+
+from geometry import STANDARD, get_geometry
+from instrumentation import SearchStats, attach, detach
+from movedb import DEFAULT_PATH, open_database
+from retrograde import DEFAULT_DIRECTORY, open_table
+from transposition import SHARED_TABLE
+
+# The board is stored as two bitboards, one integer per player.
+# Cell i of the grid (numbered left to right, top to bottom) is bit (1 << i) of the integer.
+# These are the tables of the classic 3 x 3 board, which the rest of the project (movedb.py and batch.py) reads directly.
+# They are built once, by the STANDARD Geometry.
+FULL_MASK = STANDARD.full_mask
+# WIN_MASKS holds the eight winning lines as bit masks. A player owns a line when (bits & mask) == mask.
+WIN_MASKS = STANDARD.win_masks
+# WINNING is a lookup table with one entry for each of the 512 possible bitboards of a single player.
+# WINNING[bits] is True when those pieces complete at least one winning line, so a win check is one index.
+WINNING = STANDARD.winning_table
+# EMPTY_CELLS[occupied] lists the indices of the empty cells, in increasing order,
+# for every possible mask of occupied cells.
+EMPTY_CELLS = STANDARD.empty_table
+# MOVE_PRIORITY is the order the alpha-beta search tries quiet moves in: the center first, then the corners, then the edges.
+MOVE_PRIORITY = STANDARD.move_priority
+
+# These flags are stored with alpha-beta results in the transposition table.
+# A search that is cut off only proves a bound on the value, so the table must remember which kind of value it holds.
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+# The searches with a budget read the clock (and compare the node count with the node budget) once every this many nodes.
+BUDGET_CHECK_INTERVAL = 256
+
+
+# This exception is raised inside a search when its time or node budget runs out, or when request_stop was called.
+# iddfs catches it and answers with the move of its last completed iteration.
+class SearchAborted(Exception):
+    pass
+
+
+# MoveAnalysis is the analysis of one legal move (see Engine.analyze): the move, its score for the player making it
+# (1 a forced win, 0 a draw, -1 a forced loss, within the depth searched) and its principal variation,
+# the line of best play that follows it, starting with the move itself.
+MoveAnalysis = namedtuple('MoveAnalysis', ['move', 'score', 'principal_variation'])
+
+
+# ALGORITHMS maps the name of every AI option (the names used by the Tk game) to the Engine method that implements it.
+ALGORITHMS = {
+    'BFS': 'bfs',
+    'DFS': 'dfs',
+    'Bidirectional': 'bidirectional',
+    'UCS': 'ucs',
+    'DLS': 'dls',
+    'IDDFS': 'iddfs',
+    'MCTS': 'mcts',
+}
+# The same mapping with lowercase names, so 'ucs', 'UCS' and 'Ucs' all select the same algorithm.
+_ALGORITHMS_BY_LOWER_NAME = {name.lower(): method for name, method in ALGORITHMS.items()}
+
+
+# This defines the Engine class, which holds the state of one game and runs the AI algorithms on it.
+class Engine:
+    # table is the transposition table used by ucs_search, dls_search and alphabeta_search.
+    # It is the module-level SHARED_TABLE by default, so positions solved in one game are remembered in the next.
+    table = SHARED_TABLE
+    # search_core selects how ucs, dls and iddfs search the game tree:
+    # 'alphabeta' uses alpha-beta pruning with move ordering, 'minimax' uses the plain full-width searches.
+    # Both return the same costs and pick the same moves; alpha-beta just visits far fewer nodes.
+    search_core = 'alphabeta'
+    # nodes counts the positions visited by the last call to ucs, dls or iddfs, the playouts of mcts,
+    # and the threat index queries of bfs, dfs and bidirectional (as the instrumentation counts them).
+    nodes = 0
+    # database_path is where ucs and iddfs look for the perfect-play move database built by movedb.py.
+    # When the file exists they answer with one lookup; when it is missing (or database_path is None) they search.
+    database_path = DEFAULT_PATH
+    # tables_directory is where ucs and iddfs look for the retrograde tables of the other boards (up to 4 x 4),
+    # built by retrograde.py. They are used the same way as the database; None switches them off.
+    tables_directory = DEFAULT_DIRECTORY
+    # rng supplies the random fallback moves of bfs, dfs and bidirectional.
+    # It is the random module by default; give an engine its own random.Random(seed) to make its games reproducible.
+    rng = random
+    # time_limit (in seconds) and node_limit bound every iddfs search, so a move never takes longer than that.
+    # None means no limit: iddfs then searches until the result is certain.
+    time_limit = None
+    node_limit = None
+    # principal_variation is the line of best play found by the last completed iteration of iddfs.
+    principal_variation = []
+    # stats is the SearchStats of an instrumented engine (see instrument), or None when instrumentation is off.
+    stats = None
+    # stop_requested is set by request_stop, to stop the search that is running.
+    stop_requested = False
+    # These hold the budget of the search that is running; see start_budget.
+    _deadline = None
+    _node_limit = None
+    _next_check = float('inf')
+    # mcts_iterations is the number of playouts mcts plays for every move (None means no limit), and mcts_workers the number
+    # of processes it spreads them over (1 plays them in this process). time_limit bounds mcts too.
+    # (The default is mcts.DEFAULT_ITERATIONS; mcts.py is only imported by the mcts method, to keep importing the engine cheap.)
+    mcts_iterations = 1000
+    mcts_workers = 1
+    # playouts and playouts_per_second describe the last call to mcts, to help choose mcts_workers.
+    playouts = 0
+    playouts_per_second = 0.0
+
+    # board is an optional starting position: a list (or string) of ' ', 'X' and 'O' cells, left to right, top to bottom.
+    # player is the player to move. 'X' starts the game.
+    # geometry is the shape of the board (a Geometry from geometry.py); the classic 3 x 3 board is the default.
+    def __init__(self, board=None, player='X', geometry=None):
+        if player not in ('X', 'O'):
+            raise ValueError("Unknown player: " + str(player))
+        self.geometry = geometry or STANDARD
+        # The variable current_player keeps track of the current player (either 'X' or 'O').
+        self.current_player = player
+        # bits holds one bitboard per player. Both start at 0 because every cell of the grid is empty.
+        self.bits = {'X': 0, 'O': 0}
+        if board is not None:
+            if len(board) != self.geometry.cells:
+                raise ValueError("A board must have " + str(self.geometry.cells) + " cells")
+            for i, val in enumerate(board):
+                if val in ('X', 'O'):
+                    self.bits[val] |= 1 << i
+                elif val != ' ':
+                    raise ValueError("Unknown cell value: " + repr(val))
+        # move_stack holds one entry for every move made with make_move (or place), so unmake_move can take it back.
+        self.move_stack = []
+        self.sync()
+
+    # This function recomputes the state that make_move keeps up to date from the bitboards:
+    #   hash         the Zobrist hashes of the position under every symmetry of the board, packed into one integer
+    #                (see Geometry.zobrist_moves)
+    #   empty_count  the number of empty cells
+    #   winner       the player who has completed a line ('X' or 'O'), or None
+    #   line_counts  every player's pieces on every winning line, packed into one integer per player (the threat index,
+    #                see winning_cells)
+    # It is needed only when the bitboards are changed directly.
+    def sync(self):
+        x_bits, o_bits = self.bits['X'], self.bits['O']
+        self.hash = self.geometry.zobrist_hash(x_bits, o_bits)
+        self.empty_count = self.geometry.cells - bin(x_bits | o_bits).count('1')
+        self.winner = self.winner_after()
+        self.line_counts = {'X': self.geometry.line_counts(x_bits), 'O': self.geometry.line_counts(o_bits)}
+
+    # This function plays move for player and pushes it on the move stack.
+    # Instead of rescanning the board, it updates the state incrementally: one XOR for the hashes,
+    # one decrement for the empty cells, one addition for the line counts, and a check of the lines through move for the winner.
+    # The searches call it for every hypothetical move, and unmake_move to take the move back.
+    def make_move(self, move, player):
+        geometry = self.geometry
+        self.move_stack.append((move, player, self.winner))
+        bits = self.bits[player] = self.bits[player] | 1 << move
+        self.hash ^= geometry.zobrist_moves[player][move]
+        self.empty_count -= 1
+        self.line_counts[player] += geometry.line_increments[move]
+        if self.winner is None and geometry.wins_through(bits, move):
+            self.winner = player
+
+    # This function takes back the last move on the move stack and returns its cell.
+    # The same XOR takes the move out of the hashes again, the line counts are decremented again,
+    # and the winner is restored from the stack, so nothing is recomputed.
+    def unmake_move(self):
+        geometry = self.geometry
+        move, player, self.winner = self.move_stack.pop()
+        self.bits[player] ^= 1 << move
+        self.hash ^= geometry.zobrist_moves[player][move]
+        self.empty_count += 1
+        self.line_counts[player] -= geometry.line_increments[move]
+        return move
+
+    # This function returns the canonical hash of the position and the symmetry that produced it,
+    # which is the key of the position in the transposition table. It is the smallest of the symmetric hashes.
+    def position_key(self):
+        return self.geometry.canonical_key(self.hash)
+
+    # board rebuilds the familiar list of ' ', 'X' and 'O' strings from the two bitboards.
+    @property
+    def board(self):
+        return ['X' if self.bits['X'] >> i & 1 else 'O' if self.bits['O'] >> i & 1 else ' ' for i in range(self.geometry.cells)]
+
+    # This function returns a mask with the bits of all occupied cells set, whichever player owns them.
+    def occupied(self):
+        return self.bits['X'] | self.bits['O']
+
+    # This function returns the indices of the empty cells, in increasing order.
+    # On small boards they are looked up in a table indexed by the occupied mask.
+    def empty_cells(self):
+        return self.geometry.empty_cells(self.bits['X'] | self.bits['O'])
+
+    # This function checks whether the cell at index is empty (its bit is not set in either bitboard).
+    def is_empty(self, index):
+        return not self.occupied() >> index & 1
+
+    # This function checks whether every cell of the board is taken.
+    def is_full(self):
+        return self.empty_count == 0
+
+    # This function checks if a player (either 'X' or 'O') has won the game.
+    # On small boards the winning lines were turned into a table when the Geometry was created,
+    # so the check is a single lookup of the player's bitboard.
+    def check_winner(self, player):
+        return self.geometry.wins(self.bits[player])
+
+    # This function returns the mask of the empty cells where player completes a line with one move.
+    # It is answered by the threat index (the line counts kept by make_move), without trying the moves:
+    # winning_cells('O') are the cells where 'O' wins now, and winning_cells('X') the cells where 'O' must block 'X'.
+    def winning_cells(self, player):
+        other = 'O' if player == 'X' else 'X'
+        return self.geometry.threat_cells(self.line_counts[player], self.line_counts[other], self.bits['X'] | self.bits['O'])
+
+    # This function returns the player who has won ('X' or 'O'), or None.
+    # Every line of both players is checked. (During a search, make_move keeps the winner up to date instead.)
+    def winner_after(self):
+        if self.geometry.wins(self.bits['O']):
+            return 'O'
+        if self.geometry.wins(self.bits['X']):
+            return 'X'
+        return None
+
+    # This function puts the current player's piece on the cell at index by setting the cell's bit in their bitboard.
+    # It does not switch players; switch_player does that once the caller has checked whether the game is over.
+    # The move goes on the move stack like any other, so unmake_move can take it back.
+    def place(self, index):
+        if not self.is_empty(index):
+            raise ValueError("Cell " + str(index) + " is not empty")
+        self.make_move(index, self.current_player)
+
+    # This function switches the current player from 'X' to 'O' or vice versa.
+    def switch_player(self):
+        self.current_player = 'O' if self.current_player == 'X' else 'X'
+
+    # This function plays a whole turn: it places the current player's piece on the cell at index and returns the result,
+    # the winner ('X' or 'O') or 'draw' when the board is full. If the game goes on, it switches the player and returns None.
+    # The tournament, the game log and the server play their games with it.
+    def play(self, index):
+        player = self.current_player
+        self.place(index)
+        if self.check_winner(player):
+            return player
+        if self.is_full():
+            return 'draw'
+        self.switch_player()
+        return None
+
+    # This function switches the instrumentation of this engine on, and returns the SearchStats that collects its numbers.
+    # stats is an existing SearchStats to use (a new one is created by default); callback and trace are passed to a new one.
+    # Every move chosen by best_move then gets a record in stats.moves, and is handed to the callback and written to the trace.
+    def instrument(self, stats=None, callback=None, trace=None):
+        return attach(self, stats or SearchStats(callback, trace))
+
+    # This function switches the instrumentation off again.
+    def uninstrument(self):
+        detach(self)
+
+    # This function returns the move chosen for the current player by the named algorithm
+    # ('BFS', 'DFS', 'Bidirectional', 'UCS', 'DLS', 'IDDFS' or 'MCTS', in any letter case).
+    # The algorithms are written from the point of view of 'O'. When 'X' is to move, the two bitboards are swapped
+    # for the duration of the search, so 'X' gets exactly the move 'O' would get in the mirrored position.
+    def best_move(self, algorithm):
+        method = _ALGORITHMS_BY_LOWER_NAME.get(str(algorithm).lower())
+        # If the algorithm is unknown, it raises a ValueError, just like the Tk game does when no AI option is chosen.
+        if method is None:
+            raise ValueError("Unknown AI algorithm: " + str(algorithm))
+        search = getattr(self, method)
+        if self.current_player == 'O':
+            return search()
+        self.swap_sides()
+        self.current_player = 'O'
+        try:
+            return search()
+        finally:
+            self.swap_sides()
+            self.current_player = 'X'
+
+    # This function swaps the pieces of the two players, as best_move does around the search for an 'X' move.
+    # The line counts and the winner swap with the pieces; only the hashes, which depend on the colours, are recomputed.
+    def swap_sides(self):
+        self.bits = {'X': self.bits['O'], 'O': self.bits['X']}
+        self.line_counts = {'X': self.line_counts['O'], 'O': self.line_counts['X']}
+        if self.winner is not None:
+            self.winner = 'O' if self.winner == 'X' else 'X'
+        self.hash = self.geometry.zobrist_hash(self.bits['X'], self.bits['O'])
+
+    # Implements Breadth-First Search algorithm
+    def bfs(self):
+        # This line gets the tuple of empty cell indices.
+        # The occupied cells of both players are OR-ed together and, on small boards, the result is looked up in a precomputed table,
+        # so no scan over the board is needed.
+        empty_cells = self.empty_cells()
+        # The threat index gives the mask of the empty cells where 'O' wins with one move, without simulating any move.
+        # BFS visits the empty cells in increasing order and keeps the last winning move it finds,
+        # so it plays the highest of those cells (the highest bit of the mask).
+        self.nodes = 1
+        wins = self.winning_cells('O')
+        if wins:
+            return wins.bit_length() - 1
+
+        # The code then does the same for 'X': the cells where 'X' would win are the cells 'O' must block,
+        # and again the highest of them is played.
+        self.nodes = 2
+        blocks = self.winning_cells('X')
+        if blocks:
+            return blocks.bit_length() - 1
+        # If there is no winning move for 'O' or 'X', it returns a random move from the list of empty cells.
+        # This random choice is a fallback in case no immediate winning move is found
+        return self.rng.choice(empty_cells)
+
+
+    # This dfs function implements a Depth-First Search (DFS) algorithm for making a move in the Tic Tac Toe game. 
+    # It explores the game tree by simulating moves and checking for winning conditions. Here's an explanation of the code:
+    def dfs(self):
+        # This line gets the tuple of empty cell indices.
+        empty_cells = self.empty_cells()
+        # The threat index gives the mask of the empty cells where 'O' wins with one move.
+        # Like BFS, DFS keeps the last winning move in increasing cell order, which is the highest bit of the mask.
+        self.nodes = 1
+        wins = self.winning_cells('O')
+        if wins:
+            return wins.bit_length() - 1
+
+        # The code then does the same for 'X', to find the highest cell where 'O' must block a win of 'X'.
+        self.nodes = 2
+        blocks = self.winning_cells('X')
+        if blocks:
+            return blocks.bit_length() - 1
+        # If not, it returns a random move from the list of empty cells. This random choice is a fallback in case no immediate winning move is found.
+        return self.rng.choice(empty_cells)
+
+    def bidirectional(self):
+        #  'empty_cells' = Is the tuple of the indices of all empty cells on the Tic Tac Toe board.
+        # It is computed from the mask of occupied cells of both players.
+        empty_cells = self.empty_cells()
+        # The threat index gives the mask of the empty cells where 'O' wins with one move.
+        # Bidirectional returns the first winning move it finds in increasing cell order, which is the lowest bit of the mask.
+        self.nodes = 1
+        wins = self.winning_cells('O')
+        if wins:
+            return (wins & -wins).bit_length() - 1
+
+        # This part is similar, but it looks for the cells where 'X' could win, which 'O' must block.
+        # If there is one, it returns the lowest of them.
+        self.nodes = 2
+        blocks = self.winning_cells('X')
+        if blocks:
+            return (blocks & -blocks).bit_length() - 1
+
+        # If neither 'O' nor 'X' can win with their next move, or if the list of empty cells is empty (indicating a draw situation),
+        # the code returns a random move from the list of empty cells.
+        # This is a fallback when neither player can win immediately, and the code selects a random move to continue the game.
+        return self.rng.choice(empty_cells)
+    
+    # Depth-Limited Search algorithm for selecting the best move for the computer player ('O') in Tic-Tac-Toe.
+    # The core argument picks the search core ('alphabeta' or 'minimax'); by default it is the class-wide search_core.
+    def dls(self, core=None):
+        core = core or self.search_core
+        self.nodes = 0
+        # With the alpha-beta core, the whole root loop is done by alphabeta_root.
+        # 'O' is the maximizing player in the DLS cost convention, and the depth limit of 0 below the root means a depth of 1 from here.
+        if core == 'alphabeta':
+            return self.alphabeta_root('O', 1, 'O')[0]
+        if core != 'minimax':
+            raise ValueError("Unknown search core: " + str(core))
+
+        # Find indices of empty cells on the board
+        empty_cells = self.empty_cells()
+        best_move = None
+        best_cost = float('-inf') # Initialize the best cost to negative infinity
+
+        # Iterate through each empty cell
+        for move in empty_cells:
+            # Try placing 'O' in the current empty cell
+            self.make_move(move, 'O')
+            # Use DLS search to find the cost of the move with a depth limit of 0
+            cost = self.dls_search('X', 0)  # Start with a depth limit of 0
+            # Undo the move to simulate backtracking
+            self.unmake_move()
+
+            # Update the best move and cost if the current move has a higher cost
+            if cost > best_cost:
+                best_cost = cost
+                best_move = move
+
+        # Return the best move for the computer player ('O')
+        return best_move
+
+    # The winner and the number of empty cells are kept up to date by make_move, so the game-over checks read them directly.
+    def dls_search(self, player, depth_limit):
+        self.nodes += 1
+        if self.nodes >= self._next_check:
+            self.check_budget()
+        geometry = self.geometry
+        winner = self.winner
+         # Check if 'O' has won
+        if winner == 'O':
+            return -1
+        # Check if 'X' has won
+        if winner == 'X':
+            return 1
+        # Check if the board is full or the depth limit is reached
+        if self.empty_count == 0 or depth_limit == 0:
+            return 0
+
+        # If this position (or a rotation or reflection of it) was already searched to the same depth, reuse its cost.
+        context = ('DLS', player, depth_limit)
+        key, symmetry = self.position_key()
+        entry = self.table.probe(key, symmetry, context, geometry)
+        if entry is not None:
+            return entry[0]
+
+        # Find indices of empty cells on the board
+        empty_cells = geometry.empty_cells(self.bits['X'] | self.bits['O'])
+         # Initialize the best cost based on whether it's 'O' or 'X' turn
+        best_cost = float('-inf') if player == 'O' else float('inf')
+        best_move = None
+        opponent = 'O' if player == 'X' else 'X'
+
+         # Iterate through each empty cell
+        for move in empty_cells:
+            # Try placing the current player's symbol in the empty cell
+            self.make_move(move, player)
+            # Recursively call DLS search for the next player with a decreased depth limit
+            cost = self.dls_search(opponent, depth_limit - 1)
+             # Undo the move to simulate backtracking
+            self.unmake_move()
+
+             # Update the best cost (and the move that reaches it) based on the player's turn
+            if (cost > best_cost) if player == 'O' else (cost < best_cost):
+                best_cost = cost
+                best_move = move
+
+        # Remember the result in the transposition table before returning it.
+        self.table.save(key, symmetry, best_cost, best_move, context, geometry)
+        # Return the best cost for the current player's move
+        return best_cost
+
+
+    # The core argument picks the search core ('alphabeta' or 'minimax'); by default it is the class-wide search_core.
+    def ucs(self, core=None):
+        core = core or self.search_core
+        self.nodes = 0
+        # If the perfect-play database is available, the move is read from it instead of being searched for.
+        best_move = self.database_move('O')
+        if best_move is not None:
+            return best_move
+        # With the alpha-beta core, the whole root loop is done by alphabeta_root.
+        # 'X' is the maximizing player in the UCS cost convention, and the search is not depth limited.
+        if core == 'alphabeta':
+            return self.alphabeta_root('O', None, 'X')[0]
+        if core != 'minimax':
+            raise ValueError("Unknown search core: " + str(core))
+
+        # Find all empty cells and their indices
+        empty_cells = self.empty_cells()
+         # Initialize variables to track the best move and its cost
+        best_move = None
+        best_cost = float('inf')
+
+        # Iterate through each empty cell to evaluate potential moves
+        for move in empty_cells:
+             # Make a hypothetical move for player 'O'
+            self.make_move(move, 'O')
+            # Evaluate the cost of this move using UCS search with minimizing 'X'
+            cost = self.ucs_search('X')
+            # Undo the hypothetical move
+            self.unmake_move()
+
+            # Update the best move if the current cost is better
+            if cost < best_cost:
+                best_cost = cost
+                best_move = move
+
+        # Return the best move found
+        return best_move
+
+    # depth is the number of moves left to look ahead (positions at the limit cost 0), or None to search until the game ends.
+    # The winner and the number of empty cells are kept up to date by make_move, so the game-over checks read them directly.
+    def ucs_search(self, player, depth=None):
+        self.nodes += 1
+        if self.nodes >= self._next_check:
+            self.check_budget()
+        geometry = self.geometry
+        winner = self.winner
+        # Check for game over conditions
+        if winner == 'O':
+            return -1  # Player 'O' wins, and we're minimizing, so cost is -1
+        if winner == 'X':
+            return 1  # Player 'X' wins, and we're minimizing, so cost is 1
+        if self.empty_count == 0 or depth == 0:
+            return 0  # It's a draw, or maximum depth reached, and the cost is 0
+
+        # If this position (or a rotation or reflection of it) was already solved, reuse its cost instead of searching again.
+        context = ('UCS', player) if depth is None else ('UCS', player, depth)
+        key, symmetry = self.position_key()
+        entry = self.table.probe(key, symmetry, context, geometry)
+        if entry is not None:
+            return entry[0]
+
+        # Find all empty cells and their indices
+        empty_cells = geometry.empty_cells(self.bits['X'] | self.bits['O'])
+        # Initialize the best cost depending on whether we're maximizing or minimizing
+        best_cost = float('inf') if player == 'O' else -float('inf')
+        best_move = None
+        opponent = 'O' if player == 'X' else 'X'
+
+        # Iterate through each empty cell to evaluate potential moves
+        for move in empty_cells:
+            # Make a hypothetical move for the current player
+            self.make_move(move, player)
+            # Recursively call UCS search to evaluate the cost of the move
+            cost = self.ucs_search(opponent, None if depth is None else depth - 1)
+            # Undo the hypothetical move
+            self.unmake_move()
+
+            # Update the best cost (and the move that reaches it) based on whether we're maximizing or minimizing
+            if (cost < best_cost) if player == 'O' else (cost > best_cost):
+                best_cost = cost
+                best_move = move
+
+        # Remember the result in the transposition table before returning it.
+        self.table.save(key, symmetry, best_cost, best_move, context, geometry)
+        # Return the best cost found for the current player
+        return best_cost
+
+    # This is the iterative-deepening driver. It searches the position to depth 1, 2, 3, ... and after every completed
+    # iteration it remembers the best move found so far, so it can stop at any time and still answer.
+    #   time_limit   seconds the search may take (None means no limit); the class-wide time_limit by default
+    #   node_limit   positions the search may visit (None means no limit); the class-wide node_limit by default
+    # When a limit runs out in the middle of an iteration, that iteration is dropped and the move of the last completed one is returned.
+    # Nothing is thrown away between iterations: the root moves are re-ordered with the previous best move first,
+    # and the alpha-beta core finds the best move of every position from the previous iteration in the transposition table
+    # and tries it first, so each iteration starts by following the previous principal variation.
+    # That principal variation (the line of best play the last completed iteration expects) is kept in principal_variation.
+    # The core argument picks the search core ('alphabeta' or 'minimax'); by default it is the class-wide search_core.
+    def iddfs(self, core=None, time_limit=None, node_limit=None):
+        core = core or self.search_core
+        if core not in ('alphabeta', 'minimax'):
+            raise ValueError("Unknown search core: " + str(core))
+        self.nodes = 0
+        self.principal_variation = []
+        player = self.current_player
+        # If the perfect-play database is available, the move is read from it instead of being searched for.
+        # That is the move of the deepest iteration (a search of the whole remaining game).
+        best_move = self.database_move(player)
+        if best_move is not None:
+            return best_move
+        # The first iteration tries the moves in the alpha-beta order (wins, blocks, then the best cells),
+        # and until it completes, the first of them is the answer.
+        moves = self.ordered_moves(player)
+        if not moves:
+            return None
+        best_move = moves[0]
+
+        self.start_budget(self.time_limit if time_limit is None else time_limit,
+                          self.node_limit if node_limit is None else node_limit)
+        # An iteration that runs out of budget stops with its moves still on the board, so the height of the move stack
+        # is remembered, and the moves above it are taken back.
+        stack_height = len(self.move_stack)
+        try:
+            # Set the maximum depth to explore the rest of the game
+            max_depth = len(moves)
+            # Iterate through depths from 1 to max_depth
+            for depth in range(1, max_depth + 1):
+                self.check_budget()
+                # Perform one iteration with the current depth, trying the moves in the order left by the previous one
+                best_move, best_cost = self.iddfs_search(player, depth, core, moves)
+                # The best move goes to the front, so the next iteration searches it first.
+                moves.remove(best_move)
+                moves.insert(0, best_move)
+                self.principal_variation = self.principal_line(player, best_move, depth, core)
+                # A forced win or loss found within the depth limit is final; searching deeper cannot change it.
+                if best_cost != 0:
+                    break
+        except SearchAborted:
+            while len(self.move_stack) > stack_height:
+                self.unmake_move()
+        finally:
+            self.stop_budget()
+        return best_move
+
+    # This function runs one iteration of iddfs: a depth-limited search of player's moves, in the order given by moves.
+    # It returns (best_move, best_cost), with 'O' winning costing -1 and 'X' winning costing 1, like UCS:
+    # 'X' maximizes the cost and 'O' minimizes it, so both players pick their own best move.
+    # A move only replaces the current best one if it is strictly better, so both cores choose the same move.
+    def iddfs_search(self, player, depth, core=None, moves=None):
+        core = core or self.search_core
+        if moves is None:
+            moves = self.empty_cells()
+        # With the alpha-beta core, the loop over the moves is done by alphabeta_root.
+        if core == 'alphabeta':
+            return self.alphabeta_root(player, depth, 'X', moves)
+        if core != 'minimax':
+            raise ValueError("Unknown search core: " + str(core))
+
+        maximizing = player == 'X'
+        best_cost = float('-inf') if maximizing else float('inf')
+        best_move = None
+        opponent = 'O' if player == 'X' else 'X'
+        # Iterate through each move to evaluate it
+        for move in moves:
+            # Make a hypothetical move for the current player
+            self.make_move(move, player)
+            # The cost of the move is the depth-limited cost of the position it leads to.
+            # ucs_search computes exactly that when it is given a depth (with the same cost convention).
+            cost = self.ucs_search(opponent, depth - 1)
+            # Undo the hypothetical move
+            self.unmake_move()
+
+            # Update the best_cost and best_move based on whether we're maximizing or minimizing
+            if (cost > best_cost) if maximizing else (cost < best_cost):
+                best_cost = cost
+                best_move = move
+        return best_move, best_cost
+
+    # This function returns the principal variation of an iddfs iteration of the given depth: player's move, then the best
+    # move of every position in turn, as remembered in the transposition table, until the line ends or leaves the table.
+    # depth None follows the line of a search to the end of the game.
+    def principal_line(self, player, move, depth, core):
+        geometry = self.geometry
+        line = []
+        while True:
+            self.make_move(move, player)
+            line.append(move)
+            if len(line) == depth or self.winner is not None:
+                break
+            player = 'O' if player == 'X' else 'X'
+            key, symmetry = self.position_key()
+            remaining = None if depth is None else depth - len(line)
+            if core == 'alphabeta':
+                entry = self.table.probe(key, symmetry, ('AB', 'X', player), geometry)
+                if entry is None or entry[0][0] != remaining:
+                    break
+            else:
+                context = ('UCS', player) if remaining is None else ('UCS', player, remaining)
+                entry = self.table.probe(key, symmetry, context, geometry)
+                if entry is None:
+                    break
+            move = entry[1]
+            if move is None:
+                break
+        # Undo the moves of the line, leaving the board as it was.
+        for _ in line:
+            self.unmake_move()
+        return line
+
+    # This function scores every legal move of the player to move, and returns a list of MoveAnalysis, best move first
+    # (moves with the same score in increasing cell order). depth limits how many moves ahead are searched (None: to the end).
+    # It is one alpha-beta search over all the moves: every move is searched with the full window, so its score is exact,
+    # and all of them share the transposition table, so a position reached from several root moves is only searched once.
+    # The moves are searched in the alpha-beta order, so the strongest lines fill the table first.
+    # The principal variation of every move is then read from the table, which costs no extra search.
+    # depth must be at least 1 (the root moves themselves), or it raises a ValueError.
+    def analyze(self, depth=None):
+        if depth is not None and depth < 1:
+            raise ValueError("depth must be at least 1")
+        self.nodes = 0
+        player = self.current_player
+        if self.winner is not None:
+            return []
+        opponent = 'O' if player == 'X' else 'X'
+        child_depth = None if depth is None else depth - 1
+        analysis = []
+        for move in self.ordered_moves(player):
+            self.make_move(move, player)
+            # The search uses the UCS convention ('X' maximizes the cost), which is turned into a score for player.
+            cost = self.alphabeta_search(opponent, child_depth, -1, 1, 'X')
+            self.unmake_move()
+            score = cost if player == 'X' else -cost
+            analysis.append(MoveAnalysis(move, score, self.principal_line(player, move, depth, 'alphabeta')))
+        analysis.sort(key=lambda entry: (-entry.score, entry.move))
+        return analysis
+
+    # These functions manage the search budget of iddfs.
+    # Checking the clock at every node would cost more than it saves, so the searches only compare the node counter with
+    # _next_check, and the clock is read once every BUDGET_CHECK_INTERVAL nodes. Without a budget, _next_check is infinite.
+    def start_budget(self, time_limit=None, node_limit=None):
+        self._deadline = None if time_limit is None else time.perf_counter() + time_limit
+        self._node_limit = node_limit
+        self._next_check = self.nodes
+
+    def stop_budget(self):
+        self._deadline = None
+        self._node_limit = None
+        self._next_check = 0 if self.stop_requested else float('inf')
+
+    # This function raises SearchAborted once the budget has run out (or a stop was requested),
+    # and otherwise sets the node count of the next check.
+    def check_budget(self):
+        if self.stop_requested:
+            raise SearchAborted("search stopped")
+        if self._node_limit is not None and self.nodes >= self._node_limit:
+            raise SearchAborted("node budget exhausted")
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise SearchAborted("time budget exhausted")
+        if self._deadline is not None:
+            self._next_check = self.nodes + BUDGET_CHECK_INTERVAL
+        elif self._node_limit is not None:
+            self._next_check = self._node_limit
+        else:
+            self._next_check = float('inf')
+
+    # This function asks the search running on this engine (usually in another thread) to stop.
+    # The search raises SearchAborted at its next node, and so does every later search on this engine:
+    # an engine that has been stopped is meant to be thrown away.
+    # iddfs catches the exception and returns the move of its last completed iteration; the other searches let it through.
+    def request_stop(self):
+        self.stop_requested = True
+        self._next_check = 0
+
+    # Implements Monte Carlo Tree Search with the UCT rule (see mcts.py).
+    # It plays mcts_iterations random playouts (or as many as fit in time_limit) on mcts_workers processes,
+    # and picks the move explored the most. Its random seed comes from rng, so a seeded engine always picks the same move.
+    # nodes counts the playouts, and playouts_per_second how fast they were played.
+    def mcts(self):
+        import mcts
+
+        self.nodes = 0
+        if self.winner is not None or self.is_full():
+            return None
+        seed = self.rng.getrandbits(32)
+        move, playouts, seconds = mcts.run(self.bits['X'], self.bits['O'], self.current_player,
+                                           (self.geometry.rows, self.geometry.cols, self.geometry.k),
+                                           self.mcts_iterations, self.time_limit, self.mcts_workers, seed,
+                                           should_stop=lambda: self.stop_requested)
+        if self.stop_requested:
+            raise SearchAborted("search stopped")
+        self.nodes = self.playouts = playouts
+        self.playouts_per_second = playouts / seconds if seconds else 0.0
+        return move
+
+    # This function looks the position up in the perfect-play move database, with player to move.
+    # It returns the lowest-numbered of the best moves, which is the move ucs would pick itself,
+    # because its search keeps the first move (in increasing cell order) with the best cost.
+    # It returns None when there is no database or the position is not in it, and the caller then searches as before.
+    # The database covers the classic 3 x 3 board; the other boards of up to 16 cells use their retrograde table, if it was built.
+    def database_move(self, player):
+        if self.geometry is STANDARD:
+            database = None if self.database_path is None else open_database(self.database_path)
+        else:
+            database = None if self.tables_directory is None else open_table(self.geometry, self.tables_directory)
+        if database is None:
+            return None
+        entry = database.lookup(self.bits[player], self.bits['O' if player == 'X' else 'X'])
+        if entry is None:
+            return None
+        best_moves = entry[1]
+        return (best_moves & -best_moves).bit_length() - 1
+
+    # This function orders the moves of a position for the alpha-beta search.
+    # Good moves tried first make the cutoffs happen sooner, so the order is:
+    # the move the transposition table remembers as best (hint), moves that win immediately, moves that block an immediate win
+    # of the opponent, and then the remaining cells in the geometry's move_priority order (center, corners, edges on 3 x 3).
+    def ordered_moves(self, player, hint=None):
+        # The winning and blocking cells come from the threat index, so no move has to be tried to classify it.
+        # Most positions have neither, and then all the moves are quiet and keep the move_priority order.
+        # (It asks the geometry directly rather than through winning_cells, because it runs at every node of the search.)
+        occupied = self.bits['X'] | self.bits['O']
+        win_cells, block_cells = self.geometry.threats(self.line_counts[player], self.line_counts['O' if player == 'X' else 'X'],
+                                                       occupied)
+        if not win_cells and not block_cells:
+            moves = [move for move in self.geometry.move_priority if not occupied >> move & 1 and move != hint]
+            if hint is not None:
+                moves.insert(0, hint)
+            return moves
+        wins = []
+        blocks = []
+        quiet = []
+        for move in self.geometry.move_priority:
+            bit = 1 << move
+            if occupied & bit or move == hint:
+                continue
+            if win_cells & bit:
+                wins.append(move)
+            elif block_cells & bit:
+                blocks.append(move)
+            else:
+                quiet.append(move)
+        moves = wins + blocks + quiet
+        if hint is not None:
+            moves.insert(0, hint)
+        return moves
+
+    # This is the alpha-beta search core shared by ucs, dls and iddfs.
+    # It returns the same cost as plain minimax ('O' winning costs -1, 'X' winning costs 1, anything else 0),
+    # where maximizer names the player who maximizes the cost: 'X' in UCS and IDDFS, 'O' in DLS.
+    # depth is the number of moves left to look ahead, or None to search until the game ends.
+    # alpha and beta are the bounds of the search window. Costs never leave [-1, 1], so the full window is (-1, 1),
+    # and a player who finds a forced win (a cost equal to their bound) stops scanning straight away.
+    # The winner and the number of empty cells are kept up to date by make_move, so the game-over checks read them directly.
+    def alphabeta_search(self, player, depth, alpha, beta, maximizer):
+        self.nodes += 1
+        if self.nodes >= self._next_check:
+            self.check_budget()
+        geometry = self.geometry
+        winner = self.winner
+        # Check for game over conditions or reaching the depth limit
+        if winner == 'O':
+            return -1
+        if winner == 'X':
+            return 1
+        if self.empty_count == 0 or depth is not None and depth <= 0:
+            return 0
+
+        # Look the position up in the transposition table.
+        # An entry searched to the same depth is used: an exact cost is returned straight away, and a bound narrows the window,
+        # and may close it. An entry searched to another depth (an earlier iddfs iteration) cannot give the cost,
+        # but its best move is still tried first, like the best move of every entry.
+        context = ('AB', maximizer, player)
+        key, symmetry = self.position_key()
+        entry = self.table.probe(key, symmetry, context, geometry)
+        hint = None
+        if entry is not None:
+            (entry_depth, cost, bound), hint = entry
+            if entry_depth == depth:
+                if bound == EXACT:
+                    return cost
+                if bound == LOWER_BOUND:
+                    alpha = max(alpha, cost)
+                else:
+                    beta = min(beta, cost)
+                if alpha >= beta:
+                    return cost
+        original_alpha, original_beta = alpha, beta
+
+        maximizing = player == maximizer
+        opponent = 'O' if player == 'X' else 'X'
+        child_depth = None if depth is None else depth - 1
+        best_cost = float('-inf') if maximizing else float('inf')
+        best_move = None
+        for move in self.ordered_moves(player, hint):
+            # Make a hypothetical move, search the reply, and undo the move.
+            self.make_move(move, player)
+            cost = self.alphabeta_search(opponent, child_depth, alpha, beta, maximizer)
+            self.unmake_move()
+
+            # The maximizing player raises alpha, the minimizing player lowers beta.
+            if maximizing:
+                if cost > best_cost:
+                    best_cost = cost
+                    best_move = move
+                    alpha = max(alpha, cost)
+            else:
+                if cost < best_cost:
+                    best_cost = cost
+                    best_move = move
+                    beta = min(beta, cost)
+            # Once the window is closed, the opponent will never allow this position, so the other moves are skipped.
+            if alpha >= beta:
+                break
+
+        # Store the result with the kind of value it is: a cost at or below the original alpha is only an upper bound,
+        # a cost at or above the original beta is only a lower bound, and anything in between is exact.
+        if best_cost <= original_alpha:
+            bound = UPPER_BOUND
+        elif best_cost >= original_beta:
+            bound = LOWER_BOUND
+        else:
+            bound = EXACT
+        self.table.save(key, symmetry, (depth, best_cost, bound), best_move, context, geometry)
+        return best_cost
+
+    # This function runs the root of an alpha-beta search for player and returns (best_move, best_cost).
+    # The root moves are tried in increasing cell order (or in the order of moves, if given) and a move only replaces
+    # the current best one if it is strictly better, exactly like the loops in ucs, dls and iddfs_search,
+    # so both cores choose the same move.
+    # That also means each reply only has to be searched with a window that tells whether it beats the best cost so far.
+    def alphabeta_root(self, player, depth, maximizer, moves=None):
+        maximizing = player == maximizer
+        opponent = 'O' if player == 'X' else 'X'
+        child_depth = None if depth is None else depth - 1
+        best_cost = float('-inf') if maximizing else float('inf')
+        best_move = None
+        for move in self.empty_cells() if moves is None else moves:
+            self.make_move(move, player)
+            if maximizing:
+                cost = self.alphabeta_search(opponent, child_depth, max(best_cost, -1), 1, maximizer)
+            else:
+                cost = self.alphabeta_search(opponent, child_depth, -1, min(best_cost, 1), maximizer)
+            self.unmake_move()
+
+            if (cost > best_cost) if maximizing else (cost < best_cost):
+                best_cost = cost
+                best_move = move
+            # A forced win cannot be beaten, so there is no need to look at the remaining moves.
+            if best_cost == (1 if maximizing else -1):
+                break
+        return best_move, best_cost
+
+
+# This function is the entry point for callers that just want a move:
+# it builds an Engine for the given board and player to move and asks the named algorithm for its move.
+# board is a list (or string) of ' ', 'X' and 'O' cells, and algorithm is one of the names in ALGORITHMS.
+# rows, cols and k give the shape of the board; the classic 3 x 3 board with three in a row is the default.
+def best_move(board, player, algorithm, rows=3, cols=3, k=3):
+    return Engine(board, player, get_geometry(rows, cols, k)).best_move(algorithm)
+
+
+# This function is the entry point for callers that want every move scored:
+# it builds an Engine for the given board and player to move and returns its analysis (see Engine.analyze).
+def analyze(board, player, depth=None, rows=3, cols=3, k=3):
+    return Engine(board, player, get_geometry(rows, cols, k)).analyze(depth)
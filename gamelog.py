@@ -0,0 +1,280 @@
+# Copyright (C) Muhammad Essam Abelaziz | Saturday 28 October
+#
+# If you intend to use, modify, or redistribute this code for educational purposes, you are required to
+# provide attribution by prominently displaying the following information in your project:
+#
+# Original code by Muhammad Essam Abdelaziz
+# git@github.com:Coderation/Tic-Tac-Toe-Project-with-6-Uniform-Search-Methods-for-ILLUSTRATIVE-PURPOSES.git
+
+#_________________________________________________________________________________________________________#
+
+# This module is the game log: a compact binary record format for classic 3 x 3 games, and the tools to write and replay it.
+# Every game is one 8-byte record (the moves, the two players' algorithms and the result), so a million games take 8 MB.
+# RecordWriter appends records in bulk, read_records streams them back one at a time without loading the file,
+# and the analysis stages are generators that can be chained on that stream:
+#     blunder_rates(rescore(read_records(path)))
+# re-scores every move of every game against ucs and returns how often each algorithm blundered.
+#
+# Examples:
+#     python gamelog.py record games.log --games 1000 --algorithms BFS UCS MCTS
+#     python gamelog.py analyze games.log
+import argparse
+import itertools
+import os
+import sys
+from array import array
+from collections import namedtuple
+
+from engine import Engine
+from tournament import play_game
+
+# The file starts with this 8-byte magic string, followed by one little-endian 64-bit record per game.
+MAGIC = b'TTTGLOG1'
+HEADER_SIZE = len(MAGIC)
+RECORD_SIZE = 8
+
+# Every record is laid out as follows:
+#   bits 0-35   the moves, four bits each (the first move in bits 0-3, the second in bits 4-7, ...)
+#   bits 36-39  the number of moves
+#   bits 40-43  the algorithm ID of 'X'
+#   bits 44-47  the algorithm ID of 'O'
+#   bits 48-49  the result (see RESULTS)
+MOVE_BITS = 4
+MAX_MOVES = 9
+COUNT_SHIFT = 36
+X_SHIFT = 40
+O_SHIFT = 44
+RESULT_SHIFT = 48
+
+# ALGORITHM_IDS lists the players in the order of their IDs. The IDs are written to disk, so new algorithms only go at the end.
+# HUMAN (ID 15) is a person playing, for example in the Tk game.
+HUMAN = 'Human'
+ALGORITHM_IDS = ('BFS', 'DFS', 'Bidirectional', 'UCS', 'DLS', 'IDDFS', 'MCTS')
+_IDS_BY_NAME = {name.lower(): i for i, name in enumerate(ALGORITHM_IDS)}
+_IDS_BY_NAME[HUMAN.lower()] = 15
+# RESULTS lists the results in the order of their codes: a draw, a win for 'X', a win for 'O', or an unfinished game (None).
+RESULTS = ('draw', 'X', 'O', None)
+
+# GameRecord is one decoded game: the tuple of moves (cells, 'X' first), the names of the two players and the result.
+GameRecord = namedtuple('GameRecord', ['moves', 'x_algorithm', 'o_algorithm', 'result'])
+# MoveScore is a move re-scored by rescore. value is the game value of the move for the player who made it under perfect play
+# (1 a win, 0 a draw, -1 a loss), best_value is the value of the best move in that position, and blunder is value < best_value.
+MoveScore = namedtuple('MoveScore', ['ply', 'player', 'algorithm', 'move', 'value', 'best_value', 'blunder'])
+
+
+# This function returns the ID of an algorithm (or HUMAN) name, in any letter case.
+def algorithm_id(name):
+    algorithm = _IDS_BY_NAME.get(str(name).lower())
+    if algorithm is None:
+        raise ValueError("Unknown AI algorithm: " + str(name))
+    return algorithm
+
+
+# This function returns the name of an algorithm ID.
+def algorithm_name(algorithm):
+    if algorithm == 15:
+        return HUMAN
+    if algorithm >= len(ALGORITHM_IDS):
+        raise ValueError("Unknown algorithm ID: " + str(algorithm))
+    return ALGORITHM_IDS[algorithm]
+
+
+# This function packs one game into a record (a 64-bit integer).
+def encode_game(moves, x_algorithm, o_algorithm, result):
+    if len(moves) > MAX_MOVES:
+        raise ValueError("A 3 x 3 game has at most 9 moves")
+    if result not in RESULTS:
+        raise ValueError("Unknown result: " + str(result))
+    record = len(moves) << COUNT_SHIFT
+    for i, move in enumerate(moves):
+        if not 0 <= move < 9:
+            raise ValueError("Not a cell of the 3 x 3 board: " + str(move))
+        record |= move << MOVE_BITS * i
+    record |= algorithm_id(x_algorithm) << X_SHIFT | algorithm_id(o_algorithm) << O_SHIFT
+    return record | RESULTS.index(result) << RESULT_SHIFT
+
+
+# This function unpacks a record into a GameRecord.
+def decode_record(record):
+    count = record >> COUNT_SHIFT & 15
+    moves = tuple(record >> MOVE_BITS * i & 15 for i in range(count))
+    return GameRecord(moves, algorithm_name(record >> X_SHIFT & 15), algorithm_name(record >> O_SHIFT & 15),
+                      RESULTS[record >> RESULT_SHIFT & 3])
+
+
+# This class appends games to a log file.
+# Records are collected in an array and written to the file in blocks of buffer_size records, one write per block.
+# A new (or empty) file gets the magic string first; an existing file must already be a game log.
+class RecordWriter:
+    def __init__(self, path, buffer_size=4096):
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be at least 1")
+        self.path = path
+        self.buffer_size = buffer_size
+        self.buffer = array('Q')
+        self.count = 0
+        self.file = open(path, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+        else:
+            with open(path, 'rb') as f:
+                if f.read(HEADER_SIZE) != MAGIC:
+                    self.file.close()
+                    raise ValueError("Not a game log: " + str(path))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # This function adds one game. moves are the cells played, 'X' first, and result is 'X', 'O', 'draw' or None.
+    def append(self, moves, x_algorithm, o_algorithm, result):
+        self.buffer.append(encode_game(moves, x_algorithm, o_algorithm, result))
+        self.count += 1
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    # This function adds many games, given as GameRecords or (moves, x_algorithm, o_algorithm, result) tuples.
+    def extend(self, games):
+        for game in games:
+            self.append(*game)
+
+    # This function writes the buffered records to the file.
+    def flush(self):
+        if self.buffer:
+            if sys.byteorder == 'big':
+                self.buffer.byteswap()
+            self.buffer.tofile(self.file)
+            del self.buffer[:]
+        self.file.flush()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+# This function streams the games of a log file, one GameRecord at a time.
+# The file is read chunk_size records at a time, so only one chunk is ever in memory, however big the file is.
+def read_records(path, chunk_size=65536):
+    with open(path, 'rb') as f:
+        if f.read(HEADER_SIZE) != MAGIC:
+            raise ValueError("Not a game log: " + str(path))
+        while True:
+            data = f.read(RECORD_SIZE * chunk_size)
+            if not data:
+                return
+            if len(data) % RECORD_SIZE:
+                raise ValueError("Truncated game log: " + str(path))
+            records = array('Q', data)
+            if sys.byteorder == 'big':
+                records.byteswap()
+            for record in records:
+                yield decode_record(record)
+
+
+# This function returns the number of games in a log file, from its size.
+def count_records(path):
+    return (os.path.getsize(path) - HEADER_SIZE) // RECORD_SIZE
+
+
+# This stage keeps only the games in which algorithm played (as 'X' or 'O').
+def games_of(games, algorithm):
+    for game in games:
+        if game.x_algorithm == algorithm or game.o_algorithm == algorithm:
+            yield game
+
+
+# This stage re-scores every move of every game against ucs, and yields (game, scores) with one MoveScore per move.
+# Every move is compared with all the other moves of its position, each scored by ucs_search to the end of the game.
+# The scores of a position are remembered, so a position met again (in this game or another one) is not searched again;
+# there are only a few thousand positions on the 3 x 3 board, so after a while the stage is all lookups.
+def rescore(games):
+    engine = Engine()
+    cache = {}
+    for game in games:
+        scores = []
+        player = 'X'
+        for ply, move in enumerate(game.moves):
+            if engine.winner is not None or move >= 9 or not engine.is_empty(move):
+                raise ValueError("Illegal move in game record: " + str(game))
+            key = (engine.bits['X'], engine.bits['O'])
+            values = cache.get(key)
+            if values is None:
+                values = cache[key] = move_values(engine, player)
+            value = values[move]
+            best_value = max(values.values())
+            algorithm = game.x_algorithm if player == 'X' else game.o_algorithm
+            scores.append(MoveScore(ply, player, algorithm, move, value, best_value, value < best_value))
+            engine.make_move(move, player)
+            player = 'O' if player == 'X' else 'X'
+        while engine.move_stack:
+            engine.unmake_move()
+        yield game, scores
+
+
+# This function returns the value of every move of player in the engine's position, under perfect play, for player
+# (1 a win, 0 a draw, -1 a loss), as a dictionary from cell to value.
+def move_values(engine, player):
+    opponent = 'O' if player == 'X' else 'X'
+    values = {}
+    for move in engine.empty_cells():
+        engine.make_move(move, player)
+        # ucs_search returns the cost of the position, with 'X' winning costing 1 and 'O' winning costing -1.
+        cost = engine.ucs_search(opponent)
+        engine.unmake_move()
+        values[move] = cost if player == 'X' else -cost
+    return values
+
+
+# This function consumes re-scored games and returns the blunder rate of every algorithm:
+# a dictionary from algorithm name to {'moves': moves made, 'blunders': moves worse than the best one, 'rate': their ratio}.
+def blunder_rates(scored_games):
+    totals = {}
+    for _, scores in scored_games:
+        for score in scores:
+            total = totals.setdefault(score.algorithm, {'moves': 0, 'blunders': 0})
+            total['moves'] += 1
+            total['blunders'] += score.blunder
+    for total in totals.values():
+        total['rate'] = total['blunders'] / total['moves']
+    return totals
+
+
+# This function plays games between every ordered pair of algorithms and yields them as GameRecords.
+# The games are played by tournament.play_game, game i with the seed seed + i, so the same seed always produces the same games.
+def play_games(algorithms, games, seed=0):
+    for x_algorithm, o_algorithm in itertools.permutations(algorithms, 2):
+        for i in range(games):
+            result, _, moves = play_game(x_algorithm, o_algorithm, seed + i)
+            yield GameRecord(tuple(moves), x_algorithm, o_algorithm, result)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Record games to a binary game log, or analyze a game log.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    record = commands.add_parser('record', help="play games between algorithms and append them to a log")
+    record.add_argument('path', help="the game log to append to")
+    record.add_argument('--algorithms', nargs='+', default=list(ALGORITHM_IDS), choices=list(ALGORITHM_IDS),
+                        help="algorithms taking part (default: all of them)")
+    record.add_argument('--games', type=int, default=10, help="games per ordered pair of algorithms (default: %(default)s)")
+    record.add_argument('--seed', type=int, default=0, help="seed of the first game (default: %(default)s)")
+    analyze = commands.add_parser('analyze', help="re-score every move of a log against ucs and print the blunder rates")
+    analyze.add_argument('path', help="the game log to analyze")
+    analyze.add_argument('--algorithm', help="only analyze the games this algorithm played")
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        with RecordWriter(args.path) as writer:
+            writer.extend(play_games(args.algorithms, args.games, args.seed))
+        print("Appended {} games to {} ({} in total)".format(writer.count, args.path, count_records(args.path)))
+    else:
+        games = read_records(args.path)
+        if args.algorithm:
+            games = games_of(games, args.algorithm)
+        rates = blunder_rates(rescore(games))
+        print('{:16}{:>10}{:>10}{:>10}'.format('', 'moves', 'blunders', 'rate'))
+        for algorithm in sorted(rates, key=lambda name: _IDS_BY_NAME[name.lower()]):
+            total = rates[algorithm]
+            print('{:16}{:>10}{:>10}{:>10.1%}'.format(algorithm, total['moves'], total['blunders'], total['rate']))
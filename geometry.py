@@ -0,0 +1,244 @@
+# Copyright (C) Muhammad Essam Abelaziz | Saturday 28 October
+#
+# If you intend to use, modify, or redistribute this code for educational purposes, you are required to
+# provide attribution by prominently displaying the following information in your project:
+#
+# Original code by Muhammad Essam Abdelaziz
+# git@github.com:Coderation/Tic-Tac-Toe-Project-with-6-Uniform-Search-Methods-for-ILLUSTRATIVE-PURPOSES.git
+
+#_________________________________________________________________________________________________________#
+
+# This module describes the shape of a board: an m x n grid where a player wins with k pieces in a row
+# (horizontally, vertically or diagonally). Classic Tic-Tac-Toe is the 3 x 3 board with k = 3.
+# Everything that depends only on the shape (the winning lines, the lines through each cell, the move order and the
+# symmetries of the grid) is worked out once, when the Geometry is created, and shared by every game on that board.
+# Boards are stored as bitboards: cell i (numbered left to right, top to bottom) is bit (1 << i).
+import random
+
+# Boards with at most this many cells get lookup tables indexed by a whole bitboard (2 ** cells entries each).
+# Bigger boards compute the same answers from the winning lines instead.
+TABLE_CELLS_LIMIT = 12
+# Zobrist hashes are 64 bits wide, the size of a C unsigned long long, so a packed hash (see Geometry.zobrist_moves)
+# can be split into its hashes by one memoryview cast instead of a shift and mask per hash.
+ZOBRIST_BITS = 64
+
+
+class Geometry:
+    def __init__(self, rows=3, cols=3, k=3):
+        if rows < 1 or cols < 1:
+            raise ValueError("A board needs at least one row and one column")
+        if not 1 <= k <= max(rows, cols):
+            raise ValueError("k must be between 1 and the longest side of the board")
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.cells = rows * cols
+        # full_mask has the bit of every cell set; a board whose occupied mask equals it is full.
+        self.full_mask = (1 << self.cells) - 1
+
+        # win_masks holds every winning line as a bit mask, generated once here.
+        # A line starts at every cell and goes right, down, down-right or down-left, if k cells fit in that direction.
+        win_masks = []
+        for row in range(rows):
+            for col in range(cols):
+                for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_row, end_col = row + d_row * (k - 1), col + d_col * (k - 1)
+                    if 0 <= end_row < rows and 0 <= end_col < cols:
+                        win_masks.append(sum(1 << ((row + d_row * i) * cols + col + d_col * i) for i in range(k)))
+        self.win_masks = tuple(win_masks)
+        # lines_through[cell] holds only the winning lines that pass through cell.
+        # A move can only complete one of those, so checking them after a move is enough to know whether it won.
+        self.lines_through = tuple(tuple(mask for mask in self.win_masks if mask >> cell & 1) for cell in range(self.cells))
+
+        # The threat index (see Engine.winning_cells) counts every player's pieces on every winning line.
+        # All the counts of a player are packed into one integer, line_bits bits per line, with the top bit of every field
+        # always 0 (a count never exceeds k). line_increments[cell] adds 1 to the count of every line through cell,
+        # so a move updates all the counts with one addition, and taking it back with one subtraction.
+        self.line_bits = k.bit_length() + 1
+        self.line_increments = tuple(sum(1 << self.line_bits * line for line, mask in enumerate(self.win_masks) if mask >> cell & 1)
+                                     for cell in range(self.cells))
+        line_ones = sum(1 << self.line_bits * line for line in range(len(self.win_masks)))
+        # _line_highs has the top bit of every field set, and adding _line_lows to the counts sets the top bit of every field
+        # whose count is not 0, without carrying into the next field.
+        self._line_highs = line_ones << (self.line_bits - 1)
+        self._line_lows = self._line_highs - line_ones
+        # _line_threat holds k - 1 in every field: a line with k - 1 pieces of a player and none of the opponent is a threat.
+        self._line_threat = (k - 1) * line_ones
+        # _line_chunks[j][byte] is the packed line counts of the pieces byte on the eight cells 8j to 8j+7,
+        # so counting the pieces of a whole bitboard takes one lookup per 8 cells.
+        self._line_chunks = tuple(
+            tuple(sum(self.line_increments[8 * j + bit] for bit in range(8) if byte >> bit & 1 and 8 * j + bit < self.cells)
+                  for byte in range(256))
+            for j in range((self.cells + 7) // 8)
+        )
+
+        # move_priority is the order quiet moves are tried in by the alpha-beta search:
+        # cells on more winning lines first (the center, then the corners on a 3 x 3 board), then cells nearer the center.
+        center_row, center_col = (rows - 1) / 2, (cols - 1) / 2
+        self.move_priority = tuple(sorted(range(self.cells), key=lambda cell: (
+            -len(self.lines_through[cell]), abs(cell // cols - center_row) + abs(cell % cols - center_col), cell)))
+
+        # symmetries lists the cell permutations that map the board onto itself: symmetries[s][i] is where cell i goes.
+        # Every rectangle has four (identity, the two mirrors and the half turn); a square has four more.
+        transforms = [
+            lambda r, c: (r, c),
+            lambda r, c: (r, cols - 1 - c),
+            lambda r, c: (rows - 1 - r, c),
+            lambda r, c: (rows - 1 - r, cols - 1 - c),
+        ]
+        if rows == cols:
+            transforms += [
+                lambda r, c: (c, r),
+                lambda r, c: (cols - 1 - c, rows - 1 - r),
+                lambda r, c: (c, rows - 1 - r),
+                lambda r, c: (cols - 1 - c, r),
+            ]
+        self.symmetries = tuple(
+            tuple(to_row * cols + to_col for to_row, to_col in (transform(*divmod(cell, cols)) for cell in range(self.cells)))
+            for transform in transforms
+        )
+        # inverse_symmetries[s] undoes symmetries[s].
+        self.inverse_symmetries = tuple(tuple(perm.index(cell) for cell in range(self.cells)) for perm in self.symmetries)
+
+        # zobrist holds the Zobrist keys of the board: zobrist[player][cell] is a random 64-bit number for a piece of player
+        # on cell, and the hash of a position is the XOR of the numbers of all its pieces, so a move changes it with one XOR.
+        # The numbers come from a generator seeded with the board size, so the hashes are the same in every run.
+        rng = random.Random(rows << 16 | cols)
+        self.zobrist = {player: tuple(rng.getrandbits(ZOBRIST_BITS) for _ in range(self.cells)) for player in ('X', 'O')}
+        # A position has one hash per symmetry (the hash of its transformed copy), and all of them are packed into one integer,
+        # ZOBRIST_BITS bits per symmetry. zobrist_moves[player][cell] is the packed key of a piece of player on cell:
+        # for every symmetry s, the key of the cell that s moves cell to. XOR-ing it in updates every hash of the position at once.
+        self.zobrist_moves = {player: tuple(sum(keys[perm[cell]] << ZOBRIST_BITS * s for s, perm in enumerate(self.symmetries))
+                                            for cell in range(self.cells))
+                              for player, keys in self.zobrist.items()}
+        # _zobrist_chunks[player][j][byte] is the packed key of the pieces byte on the eight cells 8j to 8j+7 together,
+        # so hashing a whole position takes one lookup per 8 cells and player.
+        self._zobrist_chunks = {
+            player: tuple(
+                tuple(self._xor(moves[8 * j + bit] for bit in range(8) if byte >> bit & 1 and 8 * j + bit < self.cells)
+                      for byte in range(256))
+                for j in range((self.cells + 7) // 8)
+            )
+            for player, moves in self.zobrist_moves.items()
+        }
+        self._zobrist_bytes = ZOBRIST_BITS // 8 * len(self.symmetries)
+
+        # Small boards also get lookup tables indexed by whole bitboards:
+        # winning_table[bits] tells whether bits completes a line, and empty_table[occupied] lists the empty cells.
+        if self.cells <= TABLE_CELLS_LIMIT:
+            self.winning_table = tuple(any(bits & mask == mask for mask in self.win_masks) for bits in range(1 << self.cells))
+            self.empty_table = tuple(tuple(i for i in range(self.cells) if not occupied >> i & 1)
+                                     for occupied in range(1 << self.cells))
+        else:
+            self.winning_table = None
+            self.empty_table = None
+
+    def __repr__(self):
+        return 'Geometry(rows={}, cols={}, k={})'.format(self.rows, self.cols, self.k)
+
+    # This function checks whether the bitboard bits completes any winning line (a full scan of the lines).
+    def wins(self, bits):
+        if self.winning_table is not None:
+            return self.winning_table[bits]
+        for mask in self.win_masks:
+            if bits & mask == mask:
+                return True
+        return False
+
+    # This function checks whether the bitboard bits completes a winning line through cell.
+    # It is the incremental win check: after a move, only the lines through the cell just played can have been completed.
+    def wins_through(self, bits, cell):
+        for mask in self.lines_through[cell]:
+            if bits & mask == mask:
+                return True
+        return False
+
+    # This function returns the indices of the empty cells, in increasing order, for a mask of occupied cells.
+    def empty_cells(self, occupied):
+        if self.empty_table is not None:
+            return self.empty_table[occupied]
+        return tuple(i for i in range(self.cells) if not occupied >> i & 1)
+
+    @staticmethod
+    def _xor(values):
+        result = 0
+        for value in values:
+            result ^= value
+        return result
+
+    # This function returns the packed line counts (see line_increments) of the pieces bits.
+    def line_counts(self, bits):
+        counts = 0
+        for table in self._line_chunks:
+            counts += table[bits & 0xFF]
+            bits >>= 8
+        return counts
+
+    # This function returns the mask of the cells where a player wins with one move, from the packed line counts of the player
+    # (own_counts) and of the opponent (other_counts).
+    # The threatening lines (k - 1 pieces of the player, none of the opponent) are found all at once, with a few operations on
+    # the packed counts; only the lines found are looked at one by one, and their empty cell is the winning move.
+    def threat_cells(self, own_counts, other_counts, occupied):
+        lows = self._line_lows
+        lines = ~((own_counts ^ self._line_threat) + lows) & ~(other_counts + lows) & self._line_highs
+        return self._line_cells(lines) & ~occupied
+
+    # This function returns the masks of the cells where each of two players wins with one move:
+    # threat_cells(own_counts, other_counts, occupied) and threat_cells(other_counts, own_counts, occupied), with less work.
+    def threats(self, own_counts, other_counts, occupied):
+        lows, threat, highs = self._line_lows, self._line_threat, self._line_highs
+        own_free = ~(own_counts + lows)
+        other_free = ~(other_counts + lows)
+        own_lines = ~((own_counts ^ threat) + lows) & other_free & highs
+        other_lines = ~((other_counts ^ threat) + lows) & own_free & highs
+        if not own_lines and not other_lines:
+            return 0, 0
+        return self._line_cells(own_lines) & ~occupied, self._line_cells(other_lines) & ~occupied
+
+    # This function returns the union of the winning lines whose field has its top bit set in lines.
+    def _line_cells(self, lines):
+        cells = 0
+        while lines:
+            line = lines & -lines
+            cells |= self.win_masks[line.bit_length() // self.line_bits - 1]
+            lines ^= line
+        return cells
+
+    # This function returns the packed Zobrist hash of a position: the hashes of its copies under every symmetry, in one integer.
+    # The Engine keeps it up to date move by move, with one XOR of zobrist_moves per move.
+    def zobrist_hash(self, x_bits, o_bits):
+        packed = 0
+        for player, bits in (('X', x_bits), ('O', o_bits)):
+            for table in self._zobrist_chunks[player]:
+                packed ^= table[bits & 0xFF]
+                bits >>= 8
+        return packed
+
+    # This function returns the canonical hash of a packed hash together with the symmetry that produced it.
+    # It is the smallest of the hashes of all the symmetric copies, so every symmetric copy of a position shares it.
+    # The bytes are always laid out little-endian, so the hash of symmetry s is entry s of the cast on every host.
+    # (On a big-endian host every entry is then byte-swapped; that changes which copy is the smallest, but consistently.)
+    def canonical_key(self, packed):
+        hashes = memoryview(packed.to_bytes(self._zobrist_bytes, 'little')).cast('Q').tolist()
+        key = min(hashes)
+        return key, hashes.index(key)
+
+    # This function returns the canonical hash of a position, and the symmetry that produced it, from its bitboards.
+    def canonical_hash(self, x_bits, o_bits):
+        return self.canonical_key(self.zobrist_hash(x_bits, o_bits))
+
+
+# Geometries are cached, so every game on the same board shares one set of lines and tables.
+_geometries = {}
+
+
+# This function returns the Geometry of an m x n board with k in a row, creating it the first time it is asked for.
+def get_geometry(rows=3, cols=3, k=3):
+    geometry = _geometries.get((rows, cols, k))
+    if geometry is None:
+        geometry = _geometries[(rows, cols, k)] = Geometry(rows, cols, k)
+    return geometry
+
+
+# STANDARD is the classic 3 x 3 Tic-Tac-Toe board with three in a row.
+STANDARD = get_geometry(3, 3, 3)
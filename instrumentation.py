@@ -0,0 +1,242 @@
+# Copyright (C) Muhammad Essam Abelaziz | Saturday 28 October
+#
+# If you intend to use, modify, or redistribute this code for educational purposes, you are required to
+# provide attribution by prominently displaying the following information in your project:
+#
+# Original code by Muhammad Essam Abdelaziz
+# git@github.com:Coderation/Tic-Tac-Toe-Project-with-6-Uniform-Search-Methods-for-ILLUSTRATIVE-PURPOSES.git
+
+#_________________________________________________________________________________________________________#
+
+# This module is the opt-in instrumentation of the searches.
+# Switching it on (Engine.instrument) puts counting and timing wrappers around the search methods of one engine,
+# as attributes of that engine. The recursive searches call themselves through self, so they call the wrappers too.
+# Switching it off (Engine.uninstrument) removes the wrappers again. The search code itself has no instrumentation
+# in it, so an engine that is not instrumented runs exactly the same code as before, at the same speed.
+#
+# For every move it counts:
+#   nodes            positions visited by the searches (for bfs, dfs and bidirectional: their threat index queries;
+#                    for mcts: its playouts)
+#   terminal_checks  game-over tests of a search position (make_move tests every move it makes)
+#   winner_checks    tests of whether a player completes a line (check_winner, the threat index queries of winning_cells,
+#                    and the line checks inside the searches)
+#   max_depth        the deepest ply below the root that was reached
+#   expanded         positions whose moves were generated; children counts those moves,
+#                    and branching_factor is their ratio
+#   phases           seconds spent in the database lookup, the move ordering, the iddfs iterations
+#                    and the principal variation (the phases can overlap: the move ordering happens inside the iterations),
+#                    and the mcts playouts
+#   iterations       for iddfs, the depth, best move, cost, nodes and seconds of every completed iteration
+import json
+import time
+
+# SEARCH_METHODS are the recursive searches. Every call is a node one ply deeper than its caller.
+SEARCH_METHODS = ('alphabeta_search', 'dls_search', 'ucs_search')
+# ROOT_METHODS are the algorithm entry points and the single iddfs iteration. Each one searches from the root position.
+ROOT_METHODS = ('ucs', 'dls', 'iddfs', 'iddfs_search', 'mcts', 'analyze')
+# SCAN_METHODS are the one-ply searches, which look at the moves of the root without recursing.
+SCAN_METHODS = ('bfs', 'dfs', 'bidirectional')
+# PHASE_METHODS maps the methods that are timed to the name of their phase.
+PHASE_METHODS = {
+    'database_move': 'database',
+    'ordered_moves': 'move_ordering',
+    'principal_line': 'principal_variation',
+}
+INSTRUMENTED_METHODS = (SEARCH_METHODS + ROOT_METHODS + SCAN_METHODS + tuple(PHASE_METHODS)
+                        + ('best_move', 'check_winner', 'winner_after', 'winning_cells', 'make_move'))
+
+
+# This class collects the numbers of one engine.
+#   callback  a function called with the record of every move (a dictionary, see record_move), or None
+#   trace     a file (anything with a write method) that gets the record of every move as one line of JSON, or None
+class SearchStats:
+    def __init__(self, callback=None, trace=None):
+        self.callback = callback
+        self.trace = trace
+        # moves holds the record of every move since the stats were created.
+        self.moves = []
+        self.reset()
+
+    # This function clears the counters of the current move. best_move calls it before every move.
+    def reset(self):
+        self.nodes = 0
+        self.terminal_checks = 0
+        self.winner_checks = 0
+        self.max_depth = 0
+        self.expanded = 0
+        self.children = 0
+        self.phases = {}
+        self.iterations = []
+        # _frames holds, for every position on the current search path, the number of its moves searched so far.
+        self._frames = []
+
+    # branching_factor is the average number of moves searched from a position whose moves were generated.
+    @property
+    def branching_factor(self):
+        return self.children / self.expanded if self.expanded else 0.0
+
+    def add_phase(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    # This function returns the counters of the current move as a dictionary.
+    def snapshot(self):
+        return {
+            'nodes': self.nodes,
+            'terminal_checks': self.terminal_checks,
+            'winner_checks': self.winner_checks,
+            'max_depth': self.max_depth,
+            'expanded': self.expanded,
+            'children': self.children,
+            'branching_factor': self.branching_factor,
+            'phases': dict(self.phases),
+            'iterations': list(self.iterations),
+        }
+
+    # This function records a finished move, hands the record to the callback and writes it to the trace.
+    def record_move(self, algorithm, player, move, seconds):
+        record = {'algorithm': algorithm, 'player': player, 'move': move, 'seconds': seconds}
+        record.update(self.snapshot())
+        self.moves.append(record)
+        if self.callback is not None:
+            self.callback(record)
+        if self.trace is not None:
+            self.trace.write(json.dumps(record) + '\n')
+            self.trace.flush()
+        return record
+
+    # This function is called by the wrappers when a new position is entered below the position on top of _frames.
+    def _enter(self):
+        frames = self._frames
+        if frames:
+            # The first move searched from a position means its moves were generated.
+            if frames[-1] == 0:
+                self.expanded += 1
+            frames[-1] += 1
+            self.children += 1
+        frames.append(0)
+
+
+# This function puts the wrappers of every instrumented method on engine, and sets engine.stats to stats.
+def attach(engine, stats):
+    detach(engine)
+    cls = type(engine)
+    engine.stats = stats
+
+    # depth is kept in a list so the wrappers can change it.
+    depth = [0]
+
+    def search_wrapper(method):
+        def wrapper(*args, **kwargs):
+            stats.nodes += 1
+            stats._enter()
+            depth[0] += 1
+            if depth[0] > stats.max_depth:
+                stats.max_depth = depth[0]
+            try:
+                return method(engine, *args, **kwargs)
+            finally:
+                depth[0] -= 1
+                stats._frames.pop()
+        return wrapper
+
+    # A root method searches from the root position, so it gets a fresh frame at depth 0.
+    # An iddfs iteration is timed, and its result is added to the list of iterations.
+    # mcts plays its playouts outside the engine (possibly in other processes), so it reports them when it is done.
+    def root_wrapper(name, method):
+        def wrapper(*args, **kwargs):
+            saved_depth = depth[0]
+            depth[0] = 0
+            stats._frames.append(0)
+            start = time.perf_counter()
+            try:
+                result = method(engine, *args, **kwargs)
+            finally:
+                depth[0] = saved_depth
+                stats._frames.pop()
+            if name == 'iddfs_search':
+                seconds = time.perf_counter() - start
+                stats.add_phase('iterations', seconds)
+                best_move, best_cost = result
+                stats.iterations.append({'depth': args[1] if len(args) > 1 else kwargs.get('depth'),
+                                         'move': best_move, 'cost': best_cost, 'nodes': stats.nodes, 'seconds': seconds})
+            elif name == 'mcts':
+                stats.nodes += engine.nodes
+                stats.add_phase('playouts', time.perf_counter() - start)
+            return result
+        return wrapper
+
+    # A one-ply scan answers from the root with line checks, so every check it makes counts as a node one ply deep.
+    def scan_wrapper(method):
+        def wrapper(*args, **kwargs):
+            before = stats.winner_checks
+            try:
+                return method(engine, *args, **kwargs)
+            finally:
+                simulated = stats.winner_checks - before
+                stats.nodes += simulated
+                stats.children += simulated
+                if simulated:
+                    stats.expanded += 1
+                    stats.max_depth = max(stats.max_depth, 1)
+        return wrapper
+
+    def phase_wrapper(phase, method):
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(engine, *args, **kwargs)
+            finally:
+                stats.add_phase(phase, time.perf_counter() - start)
+        return wrapper
+
+    def check_winner(player):
+        stats.winner_checks += 1
+        return cls.check_winner(engine, player)
+
+    def winning_cells(player):
+        stats.winner_checks += 1
+        return cls.winning_cells(engine, player)
+
+    # winner_after tests the lines of 'O' first, and those of 'X' only when 'O' has not won.
+    def winner_after():
+        stats.terminal_checks += 1
+        winner = cls.winner_after(engine)
+        stats.winner_checks += 1 if winner == 'O' else 2
+        return winner
+
+    # make_move checks the lines through its move, unless the game was already won.
+    def make_move(move, player):
+        if engine.winner is None:
+            stats.terminal_checks += 1
+            stats.winner_checks += 1
+        cls.make_move(engine, move, player)
+
+    def best_move(algorithm):
+        stats.reset()
+        player = engine.current_player
+        start = time.perf_counter()
+        move = cls.best_move(engine, algorithm)
+        stats.record_move(str(algorithm), player, move, time.perf_counter() - start)
+        return move
+
+    for name in SEARCH_METHODS:
+        setattr(engine, name, search_wrapper(getattr(cls, name)))
+    for name in ROOT_METHODS:
+        setattr(engine, name, root_wrapper(name, getattr(cls, name)))
+    for name in SCAN_METHODS:
+        setattr(engine, name, scan_wrapper(getattr(cls, name)))
+    for name, phase in PHASE_METHODS.items():
+        setattr(engine, name, phase_wrapper(phase, getattr(cls, name)))
+    engine.check_winner = check_winner
+    engine.winning_cells = winning_cells
+    engine.winner_after = winner_after
+    engine.make_move = make_move
+    engine.best_move = best_move
+    return stats
+
+
+# This function removes the wrappers from engine, so it runs the plain search methods again.
+def detach(engine):
+    for name in INSTRUMENTED_METHODS:
+        engine.__dict__.pop(name, None)
+    engine.__dict__.pop('stats', None)
@@ -0,0 +1,111 @@
+# Copyright (C) Muhammad Essam Abelaziz | Saturday 28 October
+#
+# If you intend to use, modify, or redistribute this code for educational purposes, you are required to
+# provide attribution by prominently displaying the following information in your project:
+#
+# Original code by Muhammad Essam Abdelaziz
+# git@github.com:Coderation/Tic-Tac-Toe-Project-with-6-Uniform-Search-Methods-for-ILLUSTRATIVE-PURPOSES.git
+
+#_________________________________________________________________________________________________________#
+
+# This module is a load generator for the game server in server.py.
+# It opens a number of concurrent connections, and each one plays games against the server (random legal moves for
+# the human side) for a fixed time. At the end it reports the sustained number of moves per second and the latency
+# of the MOVE requests, including the tail percentiles.
+#
+# Example (with the server already running):
+#     python loadgen.py --port 8765 --clients 32 --duration 10
+import argparse
+import asyncio
+import random
+import time
+
+from engine import ALGORITHMS
+from server import DEFAULT_HOST, DEFAULT_PORT
+from tournament import percentile
+
+# PERCENTILES are the request latency percentiles reported at the end of a run.
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+# This function sends one request line and returns the reply split into words.
+# If the server answers with an error, it raises a RuntimeError with the server's message.
+async def request(reader, writer, line):
+    writer.write(line.encode('ascii') + b'\n')
+    await writer.drain()
+    reply = (await reader.readline()).decode('ascii').split()
+    if not reply or reply[0] != 'OK':
+        raise RuntimeError("server replied " + ' '.join(reply) + " to " + line)
+    return reply[1:]
+
+
+# This function is one simulated client. It plays games on one connection until the deadline and
+# appends the latency of every MOVE request (in seconds) to latencies.
+async def client(host, port, algorithms, deadline, rng, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    games = 0
+    try:
+        while time.perf_counter() < deadline:
+            human = rng.choice('XO')
+            session, ai_move = await request(reader, writer, 'NEW ' + rng.choice(algorithms) + ' ' + human)
+            # The client keeps its own set of empty cells, updated from its moves and the AI's replies.
+            empty = set(range(9))
+            if ai_move != '-':
+                empty.discard(int(ai_move))
+            status = '-'
+            while status == '-' and time.perf_counter() < deadline:
+                move = rng.choice(sorted(empty))
+                empty.discard(move)
+                start = time.perf_counter()
+                ai_move, status = await request(reader, writer, 'MOVE ' + session + ' ' + str(move))
+                latencies.append(time.perf_counter() - start)
+                if ai_move != '-':
+                    empty.discard(int(ai_move))
+            await request(reader, writer, 'END ' + session)
+            games += 1
+        await request(reader, writer, 'QUIT')
+    finally:
+        writer.close()
+    return games
+
+
+# This function runs the whole load test and returns a summary dictionary.
+async def run_load(host=DEFAULT_HOST, port=DEFAULT_PORT, clients=16, duration=10.0, algorithms=None, seed=0):
+    algorithms = list(algorithms or ALGORITHMS)
+    latencies = []
+    start = time.perf_counter()
+    deadline = start + duration
+    games = await asyncio.gather(*(client(host, port, algorithms, deadline, random.Random(seed + i), latencies)
+                                   for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    summary = {
+        'clients': clients,
+        'seconds': elapsed,
+        'games': sum(games),
+        'moves': len(latencies),
+        'moves_per_second': len(latencies) / elapsed if elapsed else 0.0,
+    }
+    # Latencies are reported in milliseconds.
+    for p in PERCENTILES:
+        summary['p' + str(p) + '_ms'] = percentile(latencies, p) * 1e3
+    summary['max_ms'] = latencies[-1] * 1e3 if latencies else 0.0
+    return summary
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate load against the Tic-Tac-Toe game server.")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="server address (default: %(default)s)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="server port (default: %(default)s)")
+    parser.add_argument('--clients', type=int, default=16, help="concurrent connections (default: %(default)s)")
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds to run for (default: %(default)s)")
+    parser.add_argument('--algorithms', nargs='+', default=list(ALGORITHMS), choices=list(ALGORITHMS),
+                        help="algorithms to play against (default: all of them)")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the clients' moves (default: %(default)s)")
+    args = parser.parse_args()
+
+    summary = asyncio.run(run_load(args.host, args.port, args.clients, args.duration, args.algorithms, args.seed))
+    print("{games} games, {moves} moves in {seconds:.2f} s with {clients} clients".format(**summary))
+    print("sustained {moves_per_second:.1f} moves/s".format(**summary))
+    print("MOVE latency: " + ', '.join(key[:-3] + ' ' + '{:.2f} ms'.format(value)
+                                      for key, value in summary.items() if key.endswith('_ms')))
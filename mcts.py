@@ -0,0 +1,220 @@
+# Copyright (C) Muhammad Essam Abelaziz | Saturday 28 October
+#
+# If you intend to use, modify, or redistribute this code for educational purposes, you are required to
+# provide attribution by prominently displaying the following information in your project:
+#
+# Original code by Muhammad Essam Abdelaziz
+# git@github.com:Coderation/Tic-Tac-Toe-Project-with-6-Uniform-Search-Methods-for-ILLUSTRATIVE-PURPOSES.git
+
+#_________________________________________________________________________________________________________#
+
+# This module is the Monte Carlo Tree Search (MCTS) AI, using the UCT rule to pick the moves to explore.
+# Instead of searching the whole game tree like the minimax searches, it plays random games (playouts) from the position,
+# and grows a tree of the moves that did best in them. Its cost is the number of playouts, not the size of the board,
+# so it can play the bigger boards the exhaustive searches cannot finish.
+#
+# The playouts can be spread over a process pool with root parallelization: every worker grows its own tree from
+# the same position with its own random seed, and the visit counts of the root moves are added up at the end.
+# The move with the most visits is played.
+#
+# Example (playouts per second on a 5 x 5 board with 1, 2 and 4 workers):
+#     python mcts.py --rows 5 --cols 5 --k 4 --workers 1 2 4 --time-limit 2
+import argparse
+import math
+import random
+import time
+
+from geometry import get_geometry
+
+# DEFAULT_ITERATIONS is the number of playouts per move when neither an iteration nor a time budget is given.
+DEFAULT_ITERATIONS = 1000
+# EXPLORATION is the UCT exploration constant. Larger values try the less promising moves more often.
+EXPLORATION = math.sqrt(2)
+# The clock (and the stop request) is checked once every CHECK_INTERVAL playouts.
+CHECK_INTERVAL = 64
+# When searching on a pool, the caller checks for a stop request this often, in seconds, while waiting for the workers.
+POLL_SECONDS = 0.05
+
+
+# This class is a node of the search tree: the position reached by playing move.
+# mover is the player who played move (0 for 'X', 1 for 'O'), and wins counts the playouts through this node won by mover
+# (a draw counts as half a win). winner is the player who won by playing move, or None; terminal is True when the game is over.
+class Node:
+    __slots__ = ('move', 'mover', 'parent', 'children', 'untried', 'wins', 'visits', 'winner', 'terminal')
+
+    def __init__(self, move, mover, parent, untried, winner=None, terminal=False):
+        self.move = move
+        self.mover = mover
+        self.parent = parent
+        self.children = []
+        # untried holds the moves that have no child yet, in random order, so expanding one is a pop.
+        self.untried = untried
+        self.wins = 0.0
+        self.visits = 0
+        self.winner = winner
+        self.terminal = terminal
+
+
+# This function grows one UCT tree from a position and returns the statistics of the root moves and the number of playouts.
+#   x_bits, o_bits  the bitboards of the position, and player ('X' or 'O') the player to move
+#   shape           the (rows, cols, k) of the board
+#   iterations      the number of playouts to play (None for no limit)
+#   time_limit      the number of seconds to play for (None for no limit)
+#   seed            the seed of the random generator, so a search can be repeated exactly
+#   should_stop     an optional function; when it returns True the search stops early and returns what it has
+# The statistics are a dictionary from every root move that was tried to its (visits, wins) for player.
+def search_tree(x_bits, o_bits, player, shape, iterations=None, time_limit=None, seed=0, exploration=EXPLORATION,
+                should_stop=None):
+    if iterations is None and time_limit is None:
+        iterations = DEFAULT_ITERATIONS
+    geometry = get_geometry(*shape)
+    rng = random.Random(seed)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    lines_through = geometry.lines_through
+    full_mask = geometry.full_mask
+    to_move = 0 if player == 'X' else 1
+
+    untried = list(geometry.empty_cells(x_bits | o_bits))
+    rng.shuffle(untried)
+    # The root was reached by a move of the opponent of player.
+    root = Node(None, 1 - to_move, None, untried)
+    playouts = 0
+    while iterations is None or playouts < iterations:
+        if playouts % CHECK_INTERVAL == 0:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if should_stop is not None and should_stop():
+                break
+        node = root
+        bits = [x_bits, o_bits]
+
+        # Selection: while every move of the node has a child, go down to the child with the best UCT value.
+        while not node.untried and node.children:
+            log_visits = math.log(node.visits)
+            best_value = -1.0
+            for child in node.children:
+                value = child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+                if value > best_value:
+                    best_value = value
+                    node = child
+            bits[node.mover] |= 1 << node.move
+
+        # Expansion: add one child for an untried move, unless the game is already over.
+        if node.untried and not node.terminal:
+            move = node.untried.pop()
+            mover = 1 - node.mover
+            bits[mover] |= 1 << move
+            won = any(bits[mover] & mask == mask for mask in lines_through[move])
+            occupied = bits[0] | bits[1]
+            child_untried = [] if won else list(geometry.empty_cells(occupied))
+            rng.shuffle(child_untried)
+            child = Node(move, mover, node, child_untried, mover if won else None, won or occupied == full_mask)
+            node.children.append(child)
+            node = child
+
+        # Simulation: play random moves until the game ends.
+        if node.terminal:
+            winner = node.winner
+        else:
+            winner = None
+            turn = 1 - node.mover
+            empty = list(geometry.empty_cells(bits[0] | bits[1]))
+            rng.shuffle(empty)
+            for move in empty:
+                bits[turn] |= 1 << move
+                if any(bits[turn] & mask == mask for mask in lines_through[move]):
+                    winner = turn
+                    break
+                turn = 1 - turn
+
+        # Backpropagation: every node on the path counts the playout, and a win for the player who moved into it.
+        while node is not None:
+            node.visits += 1
+            if winner is None:
+                node.wins += 0.5
+            elif winner == node.mover:
+                node.wins += 1.0
+            node = node.parent
+        playouts += 1
+
+    return {child.move: (child.visits, child.wins) for child in root.children}, playouts
+
+
+# Process pools are created the first time they are asked for and then kept, because starting workers is slow.
+_pools = {}
+
+
+# This function returns the process pool with the given number of workers.
+# Its workers are started with 'spawn', so they can be created from any thread (the Tk game searches in a worker thread)
+# and do not inherit anything from the process that asked for them.
+# multiprocessing is only imported here, so importing this module (and the engine, which uses it) stays cheap.
+def get_pool(workers):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    pool = _pools.get(workers)
+    if pool is None:
+        pool = _pools[workers] = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+    return pool
+
+
+# This function runs a whole MCTS search and returns (best_move, playouts, seconds).
+# With workers > 1 the iteration budget is split between the workers of a process pool (root parallelization),
+# every worker getting its own seed; the time budget applies to each of them.
+# The best move is the root move with the most visits over all the trees (the lowest cell among equals).
+def run(x_bits, o_bits, player, shape, iterations=None, time_limit=None, workers=1, seed=0, exploration=EXPLORATION,
+        should_stop=None):
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if iterations is None and time_limit is None:
+        iterations = DEFAULT_ITERATIONS
+    start = time.perf_counter()
+    if should_stop is not None and should_stop():
+        return None, 0, 0.0
+    if workers == 1:
+        results = [search_tree(x_bits, o_bits, player, shape, iterations, time_limit, seed, exploration, should_stop)]
+    else:
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        share = None if iterations is None else -(-iterations // workers)
+        pool = get_pool(workers)
+        futures = [pool.submit(search_tree, x_bits, o_bits, player, shape, share, time_limit, seed + i, exploration)
+                   for i in range(workers)]
+        # The workers cannot be interrupted, so the caller waits in short steps and gives up on them if asked to stop.
+        pending = set(futures)
+        while pending:
+            if should_stop is not None and should_stop():
+                return None, 0, time.perf_counter() - start
+            done, pending = wait(pending, timeout=POLL_SECONDS, return_when=FIRST_COMPLETED)
+        results = [future.result() for future in futures]
+    seconds = time.perf_counter() - start
+
+    visits = {}
+    playouts = 0
+    for stats, count in results:
+        playouts += count
+        for move, (move_visits, _) in stats.items():
+            visits[move] = visits.get(move, 0) + move_visits
+    if not visits:
+        return None, playouts, seconds
+    best_move = min(visits, key=lambda move: (-visits[move], move))
+    return best_move, playouts, seconds
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure MCTS playouts per second for different numbers of workers.")
+    parser.add_argument('--rows', type=int, default=3, help="rows of the board (default: %(default)s)")
+    parser.add_argument('--cols', type=int, default=3, help="columns of the board (default: %(default)s)")
+    parser.add_argument('--k', type=int, default=3, help="pieces in a row needed to win (default: %(default)s)")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1], help="worker counts to try (default: 1)")
+    parser.add_argument('--time-limit', type=float, default=2.0, help="seconds per search (default: %(default)s)")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first worker (default: %(default)s)")
+    args = parser.parse_args()
+
+    shape = (args.rows, args.cols, args.k)
+    for workers in args.workers:
+        # A first, short search starts the pool's workers, so their start-up time is not counted.
+        run(0, 0, 'X', shape, iterations=workers, workers=workers, seed=args.seed)
+        move, playouts, seconds = run(0, 0, 'X', shape, time_limit=args.time_limit, workers=workers, seed=args.seed)
+        print("{} worker(s): {} playouts in {:.2f} s, {:.0f} playouts/s, move {}".format(
+            workers, playouts, seconds, playouts / seconds, move))
@@ -0,0 +1,150 @@
+# Copyright (C) Muhammad Essam Abelaziz | Saturday 28 October
+#
+# If you intend to use, modify, or redistribute this code for educational purposes, you are required to
+# provide attribution by prominently displaying the following information in your project:
+#
+# Original code by Muhammad Essam Abdelaziz
+# git@github.com:Coderation/Tic-Tac-Toe-Project-with-6-Uniform-Search-Methods-for-ILLUSTRATIVE-PURPOSES.git
+
+#_________________________________________________________________________________________________________#
+
+# This module builds and reads the perfect-play move database.
+# Tic-Tac-Toe is small enough to solve completely, so every reachable position is solved once, ahead of time,
+# and the value and the best moves of each position are written to a small binary file.
+# At runtime the file is memory-mapped, so every process that opens it shares the same copy,
+# and the AIs answer with a single lookup instead of a search.
+#
+# Build the database with:
+#     python movedb.py [--output PATH]
+import argparse
+import mmap
+import os
+import struct
+
+# DEFAULT_PATH is where the database is written and looked for when no other path is given.
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perfect_play.db')
+
+# The file starts with this 8-byte magic string, followed by one little-endian 16-bit entry per base-3 key.
+MAGIC = b'TTTPPDB1'
+HEADER_SIZE = len(MAGIC)
+ENTRY = struct.Struct('<H')
+# There are 3 ** 9 base-3 keys, one for every way of filling the nine cells with empty, mover and other pieces.
+KEY_COUNT = 3 ** 9
+
+# Every entry is laid out as follows:
+#   bits 0-8   the best moves, one bit per cell, like a bitboard
+#   bits 9-10  the value of the position for the player to move, plus one (0 = loss, 1 = draw, 2 = win)
+#   bit 15     set when the entry holds a solved position
+MOVES_MASK = (1 << 9) - 1
+VALUE_SHIFT = 9
+PRESENT = 1 << 15
+
+# BASE3[bits] is the base-3 number with a 1 in every digit whose bit is set in the bitboard bits.
+# The key of a position is BASE3[mover] + 2 * BASE3[other], so it is computed with two lookups.
+BASE3 = tuple(sum(3 ** i for i in range(9) if bits >> i & 1) for bits in range(1 << 9))
+
+
+# This function returns the database key of a position.
+# Positions are stored from the point of view of the player to move ('mover') rather than as 'X' and 'O',
+# so a position and the same position with the colors swapped share one entry.
+def position_key(mover_bits, other_bits):
+    return BASE3[mover_bits] + 2 * BASE3[other_bits]
+
+
+# This class is a database opened from disk.
+class MoveDatabase:
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        # The file is opened read-only and memory-mapped; the operating system shares its pages between processes.
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # If the file does not start with the magic string or has the wrong size, it is not a database this module wrote.
+        if self.mm[:HEADER_SIZE] != MAGIC or len(self.mm) != HEADER_SIZE + KEY_COUNT * ENTRY.size:
+            self.mm.close()
+            raise ValueError("Not a perfect-play database: " + str(path))
+
+    # This function looks a position up. It returns (value, best_moves) for the player to move,
+    # where value is 1 for a win, 0 for a draw and -1 for a loss under perfect play and best_moves is a bit mask of cells,
+    # or None if the position is not in the database (because it is finished or cannot be reached in a real game).
+    def lookup(self, mover_bits, other_bits):
+        entry = ENTRY.unpack_from(self.mm, HEADER_SIZE + ENTRY.size * position_key(mover_bits, other_bits))[0]
+        if not entry & PRESENT:
+            return None
+        return (entry >> VALUE_SHIFT & 3) - 1, entry & MOVES_MASK
+
+    def close(self):
+        self.mm.close()
+
+
+# Databases that are already open are kept here, so the file is mapped only once per process.
+_open_databases = {}
+
+
+# This function returns the database at path, opening and mapping it the first time it is asked for.
+# If there is no file at path it returns None, so the callers can fall back to searching.
+def open_database(path=DEFAULT_PATH):
+    database = _open_databases.get(path)
+    if database is None:
+        if not os.path.exists(path):
+            return None
+        database = _open_databases[path] = MoveDatabase(path)
+    return database
+
+
+# This function solves every position that can be reached from the empty board and returns a bytearray with the
+# database file contents. It is a plain negamax over all positions with a memo, which takes well under a second.
+def build_table():
+    # The engine is only needed to build the table, so it is imported here rather than at the top of the module.
+    from engine import EMPTY_CELLS, FULL_MASK, WINNING
+
+    solved = {}
+
+    # This function returns (value, best_moves) for the player whose pieces are mover_bits, with other_bits to reply.
+    def solve(mover_bits, other_bits):
+        key = position_key(mover_bits, other_bits)
+        if key in solved:
+            return solved[key]
+        best_value = -2
+        best_moves = 0
+        for move in EMPTY_CELLS[mover_bits | other_bits]:
+            new_bits = mover_bits | 1 << move
+            # A move that completes a line wins. A move that fills the board without winning draws.
+            # Otherwise the value of the move is the negated value of the position for the opponent.
+            if WINNING[new_bits]:
+                value = 1
+            elif new_bits | other_bits == FULL_MASK:
+                value = 0
+            else:
+                value = -solve(other_bits, new_bits)[0]
+            if value > best_value:
+                best_value = value
+                best_moves = 1 << move
+            elif value == best_value:
+                best_moves |= 1 << move
+        solved[key] = (best_value, best_moves)
+        return solved[key]
+
+    solve(0, 0)
+
+    table = bytearray(MAGIC) + bytearray(KEY_COUNT * ENTRY.size)
+    for key, (value, best_moves) in solved.items():
+        ENTRY.pack_into(table, HEADER_SIZE + ENTRY.size * key, PRESENT | (value + 1) << VALUE_SHIFT | best_moves)
+    return table
+
+
+# This function builds the database and writes it to path.
+# The file is written under a temporary name and then renamed, so a process never maps a half-written file.
+def build_database(path=DEFAULT_PATH):
+    table = build_table()
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as f:
+        f.write(table)
+    os.replace(temporary_path, path)
+    return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build the perfect-play Tic-Tac-Toe move database.")
+    parser.add_argument('--output', default=DEFAULT_PATH, help="where to write the database (default: %(default)s)")
+    args = parser.parse_args()
+    print("Wrote", build_database(args.output))
@@ -0,0 +1,372 @@
+# Copyright (C) Muhammad Essam Abelaziz | Saturday 28 October
+#
+# If you intend to use, modify, or redistribute this code for educational purposes, you are required to
+# provide attribution by prominently displaying the following information in your project:
+#
+# Original code by Muhammad Essam Abdelaziz
+# git@github.com:Coderation/Tic-Tac-Toe-Project-with-6-Uniform-Search-Methods-for-ILLUSTRATIVE-PURPOSES.git
+
+#_________________________________________________________________________________________________________#
+
+# This module builds and reads the retrograde perfect-play tables of boards bigger than 3 x 3 (up to 16 cells, so 4 x 4).
+# A 4 x 4 board has about ten million legal positions, far too many for a forward search like ucs_search, so they are
+# solved backwards instead (retrograde analysis): every position with 16 pieces first, whose values come straight from the
+# win-line check, then every position with 15 pieces, whose values follow from the 16-piece ones, and so on down to the
+# empty board. Every move adds a piece, so each layer only depends on the layer after it.
+#
+# Every legal position has a number (its index), and the table stores its value at two bits per position,
+# so the 4 x 4 table takes about 2.5 MB. The index is a perfect ranking of the positions, built with the combinatorial
+# number system: the positions are grouped by their number of pieces n, and within a group a position is numbered by
+#   the rank of its occupied cells among all sets of n cells, times the number of ways to place the mover's pieces on them,
+#   plus the rank of the mover's pieces among those ways.
+# Like the 3 x 3 database (movedb.py), positions are stored from the point of view of the player to move ('mover'),
+# who always has n // 2 of the n pieces on the board (the other player has moved as often, or once more).
+#
+# The layers are solved with NumPy, a whole slice of a layer at a time, and the slices can be spread over a process pool.
+# At runtime the table file is memory-mapped, and ucs and iddfs answer from it with one lookup per move (see Engine.database_move).
+#
+# Build a table with:
+#     python retrograde.py --rows 4 --cols 4 --k 4 [--workers 4] [--output PATH]
+import argparse
+import mmap
+import os
+import struct
+import time
+from math import comb
+
+from geometry import get_geometry
+
+# DEFAULT_DIRECTORY is where the tables are written and looked for when no other directory is given.
+DEFAULT_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+# The file starts with this header (an 8-byte magic string, then rows, cols and k), followed by the packed values:
+# the value of position i is in bits 2 * (i % 4) and 2 * (i % 4) + 1 of byte i // 4.
+MAGIC = b'TTTRETR1'
+HEADER = struct.Struct('<8sBBB5x')
+
+# These are the values stored for every position, for the player to move.
+# UNKNOWN marks the indexes of positions that cannot happen in a game (the player to move already has a line).
+UNKNOWN, LOSS, DRAW, WIN = 0, 1, 2, 3
+# The biggest boards the index covers. Every set of cells is a 16-bit mask, so the rank tables have 2 ** 16 entries.
+MAX_CELLS = 16
+
+
+# This function returns the path of the table of an m x n board with k in a row.
+def table_path(rows, cols, k, directory=DEFAULT_DIRECTORY):
+    return os.path.join(directory, 'retrograde_{}x{}_{}.tbl'.format(rows, cols, k))
+
+
+# This function returns the number of positions with n pieces on a board of cells cells, for every n from 0 to cells.
+def layer_sizes(cells):
+    return [comb(cells, n) * comb(n, n // 2) for n in range(cells + 1)]
+
+
+# The offsets of every board size are kept here, because every lookup needs them.
+_layer_offsets = {}
+
+
+# This function returns the index of the first position of every layer, and the total number of positions at the end.
+def layer_offsets(cells):
+    offsets = _layer_offsets.get(cells)
+    if offsets is None:
+        offsets = [0]
+        for size in layer_sizes(cells):
+            offsets.append(offsets[-1] + size)
+        offsets = _layer_offsets[cells] = tuple(offsets)
+    return offsets
+
+
+# COLEX_RANK[mask] is the rank of the set of cells mask among all the sets with the same number of cells,
+# in the order of the combinatorial number system, which is simply the order of their masks as numbers.
+# It is built the first time it is needed.
+_colex_rank = None
+
+
+def colex_ranks():
+    global _colex_rank
+    if _colex_rank is None:
+        counts = [0] * (MAX_CELLS + 1)
+        ranks = []
+        for mask in range(1 << MAX_CELLS):
+            n = bin(mask).count('1')
+            ranks.append(counts[n])
+            counts[n] += 1
+        _colex_rank = ranks
+    return _colex_rank
+
+
+# This function returns the index of a position on a board of cells cells, with mover_bits the pieces of the player to move,
+# or None if the position cannot happen in a game (the mover must have n // 2 of the n pieces).
+def rank(mover_bits, other_bits, cells):
+    occupied = mover_bits | other_bits
+    n = bin(occupied).count('1')
+    if mover_bits & other_bits or occupied >> cells or bin(mover_bits).count('1') != n // 2:
+        return None
+    # pattern has bit j set when the j-th occupied cell (in increasing order) holds a piece of the mover.
+    pattern = 0
+    j = 0
+    for cell in range(cells):
+        if occupied >> cell & 1:
+            if mover_bits >> cell & 1:
+                pattern |= 1 << j
+            j += 1
+    ranks = colex_ranks()
+    return layer_offsets(cells)[n] + ranks[occupied] * comb(n, n // 2) + ranks[pattern]
+
+
+# This function returns the combination of size cells out of range(length) with the given rank, as a mask.
+def _unrank_combination(rank, size, length):
+    mask = 0
+    for i in range(length - 1, -1, -1):
+        if size and comb(i, size) <= rank:
+            mask |= 1 << i
+            rank -= comb(i, size)
+            size -= 1
+    return mask
+
+
+# This function is the inverse of rank: it returns the (mover_bits, other_bits) of the position with the given index.
+def unrank(index, cells):
+    offsets = layer_offsets(cells)
+    if not 0 <= index < offsets[-1]:
+        raise ValueError("Not a position index: " + str(index))
+    n = max(layer for layer in range(cells + 1) if offsets[layer] <= index)
+    occupied_rank, pattern_rank = divmod(index - offsets[n], comb(n, n // 2))
+    occupied = _unrank_combination(occupied_rank, n, cells)
+    pattern = _unrank_combination(pattern_rank, n // 2, n)
+    mover_bits = 0
+    j = 0
+    for cell in range(cells):
+        if occupied >> cell & 1:
+            if pattern >> j & 1:
+                mover_bits |= 1 << cell
+            j += 1
+    return mover_bits, occupied ^ mover_bits
+
+
+# This class is a table opened from disk.
+class RetrogradeTable:
+    def __init__(self, path):
+        self.path = path
+        # The file is opened read-only and memory-mapped; the operating system shares its pages between processes.
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.mm) < HEADER.size:
+            self.mm.close()
+            raise ValueError("Not a retrograde table: " + str(path))
+        magic, rows, cols, k = HEADER.unpack_from(self.mm)
+        self.geometry = get_geometry(rows, cols, k) if magic == MAGIC and rows * cols <= MAX_CELLS else None
+        # If the file does not start with the magic string or has the wrong size, it is not a table this module wrote.
+        if self.geometry is None or len(self.mm) != HEADER.size + (layer_offsets(rows * cols)[-1] + 3) // 4:
+            self.mm.close()
+            raise ValueError("Not a retrograde table: " + str(path))
+
+    # This function returns the stored value (UNKNOWN, LOSS, DRAW or WIN) of a position for the player to move,
+    # or None if the position cannot happen in a game.
+    def value(self, mover_bits, other_bits):
+        index = rank(mover_bits, other_bits, self.geometry.cells)
+        if index is None:
+            return None
+        return self.mm[HEADER.size + index // 4] >> 2 * (index % 4) & 3
+
+    # This function looks a position up, exactly like MoveDatabase.lookup: it returns (value, best_moves) for the player
+    # to move, where value is 1 for a win, 0 for a draw and -1 for a loss under perfect play and best_moves is a bit mask
+    # of cells, or None if the game is over or the position cannot happen in a game.
+    # The best moves are found by looking up the position after every move.
+    def lookup(self, mover_bits, other_bits):
+        geometry = self.geometry
+        occupied = mover_bits | other_bits
+        if self.value(mover_bits, other_bits) in (None, UNKNOWN) or geometry.wins(other_bits) or occupied == geometry.full_mask:
+            return None
+        best_value = -2
+        best_moves = 0
+        for move in geometry.empty_cells(occupied):
+            new_bits = mover_bits | 1 << move
+            # A move that completes a line wins; otherwise its value is the opposite of the value for the opponent.
+            if geometry.wins_through(new_bits, move):
+                value = 1
+            else:
+                value = 2 - self.value(other_bits, new_bits)
+            if value > best_value:
+                best_value = value
+                best_moves = 1 << move
+            elif value == best_value:
+                best_moves |= 1 << move
+        return best_value, best_moves
+
+    def close(self):
+        self.mm.close()
+
+
+# Tables that are already open are kept here, so every file is mapped only once per process.
+_open_tables = {}
+
+
+# This function returns the table of the geometry from directory, opening and mapping it the first time it is asked for.
+# If the board is too big for a table, or there is no table file for it, it returns None so the callers can search instead.
+def open_table(geometry, directory=DEFAULT_DIRECTORY):
+    if geometry.cells > MAX_CELLS:
+        return None
+    path = table_path(geometry.rows, geometry.cols, geometry.k, directory)
+    table = _open_tables.get(path)
+    if table is None:
+        if not os.path.exists(path):
+            return None
+        table = _open_tables[path] = RetrogradeTable(path)
+    return table
+
+
+# These hold the NumPy tables of the process that is solving, built the first time they are needed:
+# the win table of every geometry, and the rank table and the masks of every layer.
+_solver_tables = {}
+
+
+def _numpy_tables(shape):
+    import numpy as np
+
+    tables = _solver_tables.get(shape)
+    if tables is None:
+        geometry = get_geometry(*shape)
+        bits = np.arange(1 << geometry.cells, dtype=np.int64)
+        # winning[bits] is True when the pieces bits complete a line.
+        winning = np.zeros(1 << geometry.cells, dtype=bool)
+        for mask in geometry.win_masks:
+            winning |= bits & mask == mask
+        ranks = np.array(colex_ranks()[:1 << geometry.cells], dtype=np.int64)
+        counts = np.array([bin(mask).count('1') for mask in range(1 << geometry.cells)], dtype=np.int64)
+        # masks[n] holds every set of n cells, in rank order.
+        masks = [np.nonzero(counts == n)[0] for n in range(geometry.cells + 1)]
+        tables = _solver_tables[shape] = (winning, ranks, counts, masks)
+    return tables
+
+
+# This function solves the positions of layer n (n pieces on the board) whose occupied cells have ranks start to stop,
+# and returns their values as bytes, one per position, in index order.
+# next_layer holds the values of layer n + 1, one byte per position (it is empty for the full-board layer).
+def solve_slice(shape, n, start, stop, next_layer):
+    import numpy as np
+
+    winning, ranks, counts, masks = _numpy_tables(shape)
+    cells = shape[0] * shape[1]
+    occupied = masks[n][start:stop]
+    # patterns holds every way of giving n // 2 of the n occupied cells to the mover, in rank order.
+    patterns = masks[n // 2][masks[n // 2] < 1 << n]
+
+    # cell_of[i, j] is the j-th occupied cell of the i-th set of cells; the mover's pieces are the cells its pattern selects.
+    cell_bits = (occupied[:, None] >> np.arange(cells)) & 1
+    cell_of = np.nonzero(cell_bits)[1].reshape(len(occupied), n)
+    mover = np.zeros((len(occupied), len(patterns)), dtype=np.int64)
+    for j in range(n):
+        mover |= ((patterns >> j) & 1)[None, :] << cell_of[:, j][:, None]
+    other = occupied[:, None] ^ mover
+
+    mover_wins = winning[mover]
+    other_wins = winning[other]
+    values = np.full(mover.shape, UNKNOWN, dtype=np.uint8)
+    # The player who just moved has completed a line: the player to move has lost.
+    values[other_wins & ~mover_wins] = LOSS
+    playing = ~mover_wins & ~other_wins
+    if n == cells:
+        values[playing] = DRAW
+        return values.tobytes()
+
+    # Every other position is worth the best of its moves: a win if some move leaves the opponent lost,
+    # else a draw if some move leaves a draw, else a loss.
+    next_layer = np.frombuffer(next_layer, dtype=np.uint8)
+    child_patterns = comb(n + 1, (n + 1) // 2)
+    # After a move the players swap roles, so the mover of the next position is the other player here,
+    # whose pieces are the occupied cells the pattern does not select.
+    others = ~patterns & ((1 << n) - 1)
+    best = np.full(mover.shape, LOSS, dtype=np.uint8)
+    for cell in range(cells):
+        free = np.nonzero((occupied >> cell & 1) == 0)[0]
+        if not len(free):
+            continue
+        # The new piece becomes occupied cell number below (the number of occupied cells before it) of the next position,
+        # and it is not a piece of the next mover, so a 0 is inserted into the pattern at that place.
+        below = counts[occupied[free] & ((1 << cell) - 1)][:, None]
+        child_pattern = (others[None, :] & ((1 << below) - 1)) | (others[None, :] >> below) << (below + 1)
+        child_index = ranks[occupied[free] | 1 << cell][:, None] * child_patterns + ranks[child_pattern]
+        # The value of the move for the mover is the opposite of the value of the next position for its mover.
+        best[free] = np.maximum(best[free], 4 - next_layer[child_index])
+    values[playing] = best[playing]
+    return values.tobytes()
+
+
+# This function solves every position of an m x n board with k in a row, and returns the packed table (without the header).
+# workers is the number of processes the layers are spread over (1 solves them in this process),
+# and progress is an optional function called with (n, positions, seconds) after every layer.
+def build_table(rows=4, cols=4, k=4, workers=1, progress=None):
+    import numpy as np
+
+    geometry = get_geometry(rows, cols, k)
+    cells = geometry.cells
+    if cells > MAX_CELLS:
+        raise ValueError("Retrograde tables cover boards of at most {} cells".format(MAX_CELLS))
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    shape = (rows, cols, k)
+    pool = None
+    if workers > 1:
+        # The pool is only imported when it is used, like NumPy, so the engine (which reads the tables) imports quickly.
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        layers = [None] * (cells + 1)
+        next_layer = b''
+        for n in range(cells, -1, -1):
+            start_time = time.perf_counter()
+            count = comb(cells, n)
+            # Every worker gets a few slices of the layer, so a slow slice does not keep the others waiting.
+            step = max(1, -(-count // (workers * 4)))
+            bounds = [(start, min(start + step, count)) for start in range(0, count, step)]
+            if pool is None:
+                slices = [solve_slice(shape, n, start, stop, next_layer) for start, stop in bounds]
+            else:
+                slices = list(pool.map(solve_slice, *zip(*[(shape, n, start, stop, next_layer) for start, stop in bounds])))
+            layers[n] = next_layer = b''.join(slices)
+            if progress is not None:
+                progress(n, len(next_layer), time.perf_counter() - start_time)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    # The values of all the layers are packed four to a byte, in index order.
+    values = np.frombuffer(b''.join(layers), dtype=np.uint8)
+    values = np.concatenate([values, np.zeros(-len(values) % 4, dtype=np.uint8)]).reshape(-1, 4)
+    packed = values[:, 0] | values[:, 1] << 2 | values[:, 2] << 4 | values[:, 3] << 6
+    return packed.astype(np.uint8).tobytes()
+
+
+# This function builds the table of an m x n board with k in a row and writes it to path.
+# The file is written under a temporary name and then renamed, so a process never maps a half-written file.
+def build_file(rows=4, cols=4, k=4, path=None, workers=1, progress=None):
+    path = path or table_path(rows, cols, k)
+    table = build_table(rows, cols, k, workers, progress)
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, rows, cols, k))
+        f.write(table)
+    os.replace(temporary_path, path)
+    return path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Solve every position of a board by retrograde analysis.")
+    parser.add_argument('--rows', type=int, default=4, help="rows of the board (default: %(default)s)")
+    parser.add_argument('--cols', type=int, default=4, help="columns of the board (default: %(default)s)")
+    parser.add_argument('--k', type=int, default=4, help="pieces in a row needed to win (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="processes to solve with (default: %(default)s)")
+    parser.add_argument('--output', help="where to write the table (default: next to this module)")
+    args = parser.parse_args()
+
+    def report(n, positions, seconds):
+        print("{:2} pieces: {:9} positions in {:.2f} s".format(n, positions, seconds))
+
+    path = build_file(args.rows, args.cols, args.k, args.output, args.workers, report)
+    table = RetrogradeTable(path)
+    value, _ = table.lookup(0, 0)
+    print("Wrote", path, "- the first player", {1: 'wins', 0: 'draws', -1: 'loses'}[value], "with perfect play")
@@ -0,0 +1,192 @@
+# Copyright (C) Muhammad Essam Abelaziz | Saturday 28 October
+#
+# If you intend to use, modify, or redistribute this code for educational purposes, you are required to
+# provide attribution by prominently displaying the following information in your project:
+#
+# Original code by Muhammad Essam Abdelaziz
+# git@github.com:Coderation/Tic-Tac-Toe-Project-with-6-Uniform-Search-Methods-for-ILLUSTRATIVE-PURPOSES.git
+
+#_________________________________________________________________________________________________________#
+
+# This module is an asyncio game server that serves many games at once from one process.
+# Clients talk to it over TCP with a line protocol; every request is one line and gets exactly one reply line.
+#
+#   NEW <algorithm> [X|O]   start a game against the named AI ('BFS', 'DFS', 'Bidirectional', 'UCS', 'DLS', 'IDDFS' or 'MCTS',
+#                           in any letter case), playing as 'X' (the default, moving first) or 'O'.
+#                           Reply: OK <session> <ai_move>     (ai_move is '-' unless the AI moved first)
+#   MOVE <session> <cell>   play a move (cell 0-8). The AI replies straight away unless the game is over.
+#                           Reply: OK <ai_move> <status>      (status is '-' while the game goes on, else 'X', 'O' or 'draw')
+#   BOARD <session>         Reply: OK <cells> <to_move> <status>   (cells is nine characters, '.' for an empty cell)
+#   END <session>           forget a game. Reply: OK
+#   QUIT                    close the connection. Reply: OK
+# Errors are reported as: ERR <message>
+#
+# The AI searches run in an executor (a process pool by default), so a slow search never blocks the event loop
+# and the other sessions keep being served while it runs. Sessions belong to the connection that created them
+# and are dropped when it closes.
+#
+# Example:
+#     python server.py --port 8765 --workers 4
+import argparse
+import asyncio
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from engine import ALGORITHMS, Engine, best_move
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+# Algorithm names are matched in any letter case, like Engine.best_move does; this maps them to their names in ALGORITHMS.
+ALGORITHM_NAMES = {name.lower(): name for name in ALGORITHMS}
+
+
+# This function creates the default process pool for the searches.
+# Its workers are started with 'spawn', so they do not inherit the listening socket of the server;
+# otherwise a worker left behind by a killed server would keep the port open without ever answering.
+def search_pool(workers=None):
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'))
+
+
+# This class holds the state of one game: the board and side to move (in an Engine), the AI algorithm and the human's side.
+# The requests of a connection are handled one at a time, so a session is never used by two requests at once.
+class Session:
+    def __init__(self, algorithm, human):
+        self.engine = Engine()
+        self.algorithm = algorithm
+        self.human = human
+        self.status = '-'
+
+    # This function plays a move for the player to move and updates the status ('-', 'X', 'O' or 'draw').
+    def play(self, index):
+        self.status = self.engine.play(index) or '-'
+
+    # This function returns the board as nine characters, with '.' for an empty cell.
+    def cells(self):
+        return ''.join('.' if cell == ' ' else cell for cell in self.engine.board)
+
+
+# This class is the server. It hands out session ids and routes the requests of every connection.
+class GameServer:
+    def __init__(self, executor=None):
+        # executor runs the AI searches. A process pool gives real parallelism between searches.
+        self.executor = executor or search_pool()
+        self.sessions = {}
+        self.session_ids = itertools.count(1)
+
+    # This function asks the executor for the AI's move in a session and plays it.
+    # Only the board, the player to move and the algorithm are sent to the worker, so nothing needs to be shared.
+    async def ai_move(self, session):
+        loop = asyncio.get_running_loop()
+        move = await loop.run_in_executor(self.executor, best_move, session.engine.board,
+                                          session.engine.current_player, session.algorithm)
+        session.play(move)
+        return move
+
+    async def command_new(self, owned, args):
+        if not 1 <= len(args) <= 2:
+            raise ValueError("usage: NEW <algorithm> [X|O]")
+        algorithm = ALGORITHM_NAMES.get(args[0].lower())
+        if algorithm is None:
+            raise ValueError("unknown algorithm " + args[0])
+        human = args[1].upper() if len(args) == 2 else 'X'
+        if human not in ('X', 'O'):
+            raise ValueError("side must be X or O")
+        session_id = str(next(self.session_ids))
+        session = self.sessions[session_id] = Session(algorithm, human)
+        owned.add(session_id)
+        ai_move = '-'
+        # If the human plays 'O', the AI ('X') moves first.
+        if human == 'O':
+            ai_move = await self.ai_move(session)
+        return session_id + ' ' + str(ai_move)
+
+    async def command_move(self, session, args):
+        if len(args) != 1 or not args[0].isdigit():
+            raise ValueError("usage: MOVE <session> <cell>")
+        index = int(args[0])
+        if session.status != '-':
+            raise ValueError("game is over")
+        if session.engine.current_player != session.human:
+            raise ValueError("not your turn")
+        if not 0 <= index < 9 or not session.engine.is_empty(index):
+            raise ValueError("illegal move")
+        session.play(index)
+        ai_move = '-'
+        if session.status == '-':
+            ai_move = await self.ai_move(session)
+        return str(ai_move) + ' ' + session.status
+
+    # This function handles one request line and returns the reply line (without the trailing newline).
+    async def handle_line(self, owned, line):
+        parts = line.split()
+        if not parts:
+            raise ValueError("empty request")
+        command, args = parts[0].upper(), parts[1:]
+        if command == 'NEW':
+            return 'OK ' + await self.command_new(owned, args)
+        if command in ('MOVE', 'BOARD', 'END'):
+            if not args or args[0] not in owned:
+                raise ValueError("unknown session")
+            session_id = args[0]
+            session = self.sessions[session_id]
+            if command == 'END':
+                owned.discard(session_id)
+                del self.sessions[session_id]
+                return 'OK'
+            if command == 'MOVE':
+                return 'OK ' + await self.command_move(session, args[1:])
+            return 'OK ' + session.cells() + ' ' + session.engine.current_player + ' ' + session.status
+        raise ValueError("unknown command " + command)
+
+    # This function serves one connection until the client sends QUIT or disconnects.
+    async def handle_client(self, reader, writer):
+        # owned holds the ids of the sessions created on this connection; they are dropped when it closes.
+        owned = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.decode('ascii', 'replace').strip()
+                if line.upper() == 'QUIT':
+                    writer.write(b'OK\n')
+                    break
+                try:
+                    reply = await self.handle_line(owned, line)
+                except ValueError as error:
+                    reply = 'ERR ' + str(error)
+                writer.write(reply.encode('ascii', 'replace') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for session_id in owned:
+                self.sessions.pop(session_id, None)
+            writer.close()
+
+    # This function starts listening and returns the asyncio server object.
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        return await asyncio.start_server(self.handle_client, host, port)
+
+    async def serve_forever(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve Tic-Tac-Toe games against the AI algorithms over TCP.")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="address to listen on (default: %(default)s)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="port to listen on (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=None, help="search workers (default: one per CPU)")
+    parser.add_argument('--threads', action='store_true',
+                        help="run searches in a thread pool instead of a process pool")
+    args = parser.parse_args()
+
+    pool = ThreadPoolExecutor(args.workers) if args.threads else search_pool(args.workers)
+    with pool:
+        try:
+            asyncio.run(GameServer(pool).serve_forever(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,527 @@
+# Copyright (C) Muhammad Essam Abelaziz | Saturday 28 October
+#
+# If you intend to use, modify, or redistribute this code for educational purposes, you are required to
+# provide attribution by prominently displaying the following information in your project:
+#
+# Original code by Muhammad Essam Abdelaziz
+# git@github.com:Coderation/Tic-Tac-Toe-Project-with-6-Uniform-Search-Methods-for-ILLUSTRATIVE-PURPOSES.git
+
+#_________________________________________________________________________________________________________#
+
+# These are the regression tests of the bit-packed parts of the engine: the Zobrist hashes and their canonical keys,
+# the alpha-beta core checked against plain minimax, the position ranking and 2-bit values of the retrograde tables,
+# and the packed line counts of the threat index, together with the rest of the state make_move keeps up to date.
+# It also has behaviour tests of the features built on the searches: the budgets of iddfs, stopping a search,
+# the instrumentation, MCTS, the game log, analyze and batch evaluation.
+# They use small boards (3 x 3, 3 x 4 and 4 x 4 with k = 3, and 4 x 4 with k = 4 where a search must not finish),
+# so the whole module runs in a few seconds.
+# The retrograde tests need NumPy, like building a table does, and are skipped without it.
+#
+# Example:
+#     python -m pytest -q test_engine.py
+import io
+import json
+import random
+import threading
+import time
+
+import pytest
+
+import gamelog
+import movedb
+import retrograde
+from engine import BUDGET_CHECK_INTERVAL, Engine, SearchAborted
+from geometry import STANDARD, ZOBRIST_BITS, get_geometry
+
+# SHAPES are the (rows, cols, k) of the boards the tests run on.
+SHAPES = ((3, 3, 3), (3, 4, 3), (4, 4, 3))
+
+
+# The perfect-play database and the retrograde tables would answer ucs and iddfs without searching,
+# and the transposition table is shared by every engine, so every test starts without them.
+@pytest.fixture(autouse=True)
+def searching_engine(monkeypatch):
+    monkeypatch.setattr(Engine, 'database_path', None)
+    monkeypatch.setattr(Engine, 'tables_directory', None)
+    Engine.table.clear()
+    yield
+    Engine.table.clear()
+
+
+# This function returns every reachable 3 x 3 position where the game is not over yet, as (board, player) pairs.
+def reachable_positions():
+    positions = set()
+    stack = [(0, 0)]
+    while stack:
+        x_bits, o_bits = stack.pop()
+        if (x_bits, o_bits) in positions or STANDARD.wins(x_bits) or STANDARD.wins(o_bits):
+            continue
+        occupied = x_bits | o_bits
+        if occupied == STANDARD.full_mask:
+            continue
+        positions.add((x_bits, o_bits))
+        x_to_move = bin(x_bits).count('1') == bin(o_bits).count('1')
+        for move in STANDARD.empty_cells(occupied):
+            stack.append((x_bits | 1 << move, o_bits) if x_to_move else (x_bits, o_bits | 1 << move))
+    return [(board_of(STANDARD, x_bits, o_bits), 'X' if bin(x_bits).count('1') == bin(o_bits).count('1') else 'O')
+            for x_bits, o_bits in sorted(positions)]
+
+
+# This function returns the board (a string of ' ', 'X' and 'O') of two bitboards.
+def board_of(geometry, x_bits, o_bits):
+    return ''.join('X' if x_bits >> cell & 1 else 'O' if o_bits >> cell & 1 else ' ' for cell in range(geometry.cells))
+
+
+# This function returns n random legal positions of a geometry (games played with random moves, cut at a random ply),
+# as (x_bits, o_bits) pairs.
+def random_positions(geometry, n, seed=0):
+    rng = random.Random(seed)
+    positions = []
+    for _ in range(n):
+        bits = [0, 0]
+        for ply in range(rng.randrange(geometry.cells + 1)):
+            move = rng.choice(geometry.empty_cells(bits[0] | bits[1]))
+            bits[ply % 2] |= 1 << move
+            if geometry.wins(bits[ply % 2]):
+                break
+        positions.append(tuple(bits))
+    return positions
+
+
+# This function applies the cell permutation perm (a Geometry symmetry) to the bitboard bits.
+def permute(bits, perm):
+    return sum(1 << perm[cell] for cell in range(len(perm)) if bits >> cell & 1)
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+def test_zobrist_hash_is_incremental(shape):
+    geometry = get_geometry(*shape)
+    for x_bits, o_bits in random_positions(geometry, 200):
+        packed = 0
+        for cell in range(geometry.cells):
+            if x_bits >> cell & 1:
+                packed ^= geometry.zobrist_moves['X'][cell]
+            if o_bits >> cell & 1:
+                packed ^= geometry.zobrist_moves['O'][cell]
+        assert geometry.zobrist_hash(x_bits, o_bits) == packed
+
+
+@pytest.mark.parametrize('shape', SHAPES)
+def test_canonical_key_is_shared_by_symmetric_copies(shape):
+    geometry = get_geometry(*shape)
+    mask = (1 << ZOBRIST_BITS) - 1
+    for x_bits, o_bits in random_positions(geometry, 200):
+        packed = geometry.zobrist_hash(x_bits, o_bits)
+        key, symmetry = geometry.canonical_key(packed)
+        # The symmetry returned is the one whose hash is the key.
+        assert key == packed >> ZOBRIST_BITS * symmetry & mask
+        for perm in geometry.symmetries:
+            copy_key, copy_symmetry = geometry.canonical_hash(permute(x_bits, perm), permute(o_bits, perm))
+            assert copy_key == key
+            # Both symmetries take their position to the same canonical orientation.
+            canonical_x = permute(x_bits, geometry.symmetries[symmetry])
+            assert permute(permute(x_bits, perm), geometry.symmetries[copy_symmetry]) == canonical_x
+
+
+# A best move stored by one symmetric copy of a position must come back, in every other copy, as an empty cell
+# that leads to a copy of the same position (the move itself, or an equivalent one when the position is symmetric).
+@pytest.mark.parametrize('shape', SHAPES)
+def test_transposition_hint_maps_back_to_an_equivalent_move(shape):
+    geometry = get_geometry(*shape)
+    for x_bits, o_bits in random_positions(geometry, 100, seed=1):
+        empty = geometry.empty_cells(x_bits | o_bits)
+        if not empty or geometry.wins(x_bits) or geometry.wins(o_bits):
+            continue
+        move = empty[len(empty) // 2]
+        Engine.table.store(x_bits, o_bits, 0, move, ('test',), geometry)
+        after = geometry.canonical_hash(x_bits | 1 << move, o_bits)[0]
+        for perm in geometry.symmetries:
+            copy_x, copy_o = permute(x_bits, perm), permute(o_bits, perm)
+            value, hint = Engine.table.lookup(copy_x, copy_o, ('test',), geometry)
+            assert not (copy_x | copy_o) >> hint & 1
+            assert geometry.canonical_hash(copy_x | 1 << hint, copy_o)[0] == after
+        Engine.table.clear()
+
+
+# The alpha-beta core must pick the same move as plain minimax in every reachable 3 x 3 position.
+@pytest.mark.parametrize('algorithm', ['ucs', 'dls', 'iddfs'])
+def test_alphabeta_matches_minimax(algorithm):
+    for board, player in reachable_positions():
+        moves = {}
+        for core in ('minimax', 'alphabeta'):
+            engine = Engine(board, player)
+            engine.search_core = core
+            moves[core] = engine.best_move(algorithm)
+        assert moves['alphabeta'] == moves['minimax'], (board, player)
+
+
+# This function returns the value of a position for the player to move (mover_bits), under perfect play:
+# 1 a win, 0 a draw and -1 a loss. It is a plain negamax, independent of the retrograde solver.
+def negamax(geometry, mover_bits, other_bits, memo):
+    key = (mover_bits, other_bits)
+    if key not in memo:
+        occupied = mover_bits | other_bits
+        best_value = 0 if occupied == geometry.full_mask else -1
+        for move in geometry.empty_cells(occupied):
+            new_bits = mover_bits | 1 << move
+            if geometry.wins_through(new_bits, move):
+                best_value = 1
+                break
+            best_value = max(best_value, -negamax(geometry, other_bits, new_bits, memo))
+            if best_value == 1:
+                break
+        memo[key] = best_value
+    return memo[key]
+
+
+# The tables are built once for the whole module, in a temporary directory.
+@pytest.fixture(scope='module')
+def retrograde_tables(tmp_path_factory):
+    pytest.importorskip('numpy')
+    directory = str(tmp_path_factory.mktemp('retrograde'))
+    return {shape: retrograde.RetrogradeTable(retrograde.build_file(*shape, path=retrograde.table_path(*shape, directory)))
+            for shape in SHAPES}
+
+
+@pytest.mark.parametrize('cells', [9, 12, 16])
+def test_rank_round_trips(cells):
+    total = retrograde.layer_offsets(cells)[-1]
+    rng = random.Random(cells)
+    for index in [0, 1, total - 1] + [rng.randrange(total) for _ in range(2000)]:
+        mover_bits, other_bits = retrograde.unrank(index, cells)
+        assert not mover_bits & other_bits
+        assert retrograde.rank(mover_bits, other_bits, cells) == index
+
+
+def test_rank_rejects_impossible_positions():
+    # The player to move must have n // 2 of the n pieces, and the pieces must be on the board.
+    assert retrograde.rank(0b11, 0, 9) is None
+    assert retrograde.rank(0b1, 0b1, 9) is None
+    assert retrograde.rank(0, 1 << 9, 9) is None
+    with pytest.raises(ValueError):
+        retrograde.unrank(retrograde.layer_offsets(9)[-1], 9)
+
+
+# The 3 x 3 table must give the same value and best moves as the perfect-play database for every position in it.
+def test_retrograde_table_matches_move_database(retrograde_tables, tmp_path):
+    database = movedb.MoveDatabase(movedb.build_database(str(tmp_path / 'perfect_play.db')))
+    table = retrograde_tables[(3, 3, 3)]
+    compared = 0
+    try:
+        for index in range(retrograde.layer_offsets(9)[-1]):
+            mover_bits, other_bits = retrograde.unrank(index, 9)
+            expected = database.lookup(mover_bits, other_bits)
+            if expected is not None:
+                assert table.lookup(mover_bits, other_bits) == expected, (mover_bits, other_bits)
+                compared += 1
+    finally:
+        database.close()
+    # Every reachable position where the game is not over is in the database.
+    assert compared == len(reachable_positions())
+
+
+@pytest.mark.parametrize('shape', SHAPES[1:])
+def test_retrograde_table_matches_negamax(retrograde_tables, shape):
+    geometry = get_geometry(*shape)
+    table = retrograde_tables[shape]
+    memo = {}
+    for x_bits, o_bits in random_positions(geometry, 300, seed=2):
+        if bin(x_bits | o_bits).count('1') < geometry.cells // 2:
+            continue
+        mover_bits, other_bits = (x_bits, o_bits) if bin(x_bits).count('1') == bin(o_bits).count('1') else (o_bits, x_bits)
+        entry = table.lookup(mover_bits, other_bits)
+        if geometry.wins(other_bits) or mover_bits | other_bits == geometry.full_mask:
+            assert entry is None
+            continue
+        value, best_moves = entry
+        assert value == negamax(geometry, mover_bits, other_bits, memo)
+        # Every best move reaches a position worth value, for the player who made it.
+        for move in geometry.empty_cells(mover_bits | other_bits):
+            new_bits = mover_bits | 1 << move
+            move_value = 1 if geometry.wins_through(new_bits, move) else -negamax(geometry, other_bits, new_bits, memo)
+            assert (move_value == value) == bool(best_moves >> move & 1)
+
+
+# This function returns the state make_move keeps up to date, to compare it with the state sync computes.
+def incremental_state(engine):
+    return engine.hash, engine.empty_count, engine.winner, dict(engine.line_counts)
+
+
+# The state kept up to date by make_move and unmake_move (and swapped by swap_sides) must equal the state sync recomputes.
+@pytest.mark.parametrize('shape', SHAPES)
+def test_incremental_state_matches_sync(shape):
+    geometry = get_geometry(*shape)
+    rng = random.Random(3)
+    for _ in range(50):
+        engine = Engine(geometry=geometry)
+        player = 'X'
+        states = [incremental_state(engine)]
+        while engine.winner is None and not engine.is_full():
+            engine.make_move(rng.choice(engine.empty_cells()), player)
+            player = 'O' if player == 'X' else 'X'
+            engine.current_player = player
+            state = incremental_state(engine)
+            engine.sync()
+            assert incremental_state(engine) == state
+            states.append(state)
+            engine.swap_sides()
+            swapped = incremental_state(engine)
+            engine.sync()
+            assert incremental_state(engine) == swapped
+            engine.swap_sides()
+            assert incremental_state(engine) == state
+        # Taking every move back restores every earlier state.
+        while engine.move_stack:
+            states.pop()
+            engine.unmake_move()
+            assert incremental_state(engine)[:3] == states[-1][:3]
+            assert engine.line_counts == states[-1][3]
+
+
+# This function returns the mask of the empty cells where the pieces bits complete a line with one more piece,
+# by trying every empty cell.
+def brute_force_threats(geometry, bits, occupied):
+    return sum(1 << move for move in geometry.empty_cells(occupied) if geometry.wins_through(bits | 1 << move, move))
+
+
+@pytest.mark.parametrize('shape', SHAPES + ((4, 4, 4), (5, 5, 4)))
+def test_threat_index_matches_brute_force(shape):
+    geometry = get_geometry(*shape)
+    for x_bits, o_bits in random_positions(geometry, 300, seed=4):
+        occupied = x_bits | o_bits
+        x_counts, o_counts = geometry.line_counts(x_bits), geometry.line_counts(o_bits)
+        x_threats = brute_force_threats(geometry, x_bits, occupied)
+        o_threats = brute_force_threats(geometry, o_bits, occupied)
+        assert geometry.threat_cells(x_counts, o_counts, occupied) == x_threats
+        assert geometry.threat_cells(o_counts, x_counts, occupied) == o_threats
+        assert geometry.threats(x_counts, o_counts, occupied) == (x_threats, o_threats)
+        engine = Engine(board_of(geometry, x_bits, o_bits), geometry=geometry)
+        assert (engine.winning_cells('X'), engine.winning_cells('O')) == (x_threats, o_threats)
+
+
+# bfs and dfs play the highest cell where 'O' wins (or else must block), and bidirectional the lowest.
+def test_one_ply_scans_use_the_threat_index():
+    for board, _ in reachable_positions():
+        engine = Engine(board, 'O')
+        occupied = engine.bits['X'] | engine.bits['O']
+        wins = brute_force_threats(STANDARD, engine.bits['O'], occupied)
+        blocks = brute_force_threats(STANDARD, engine.bits['X'], occupied)
+        threats = wins or blocks
+        if threats:
+            assert engine.best_move('BFS') == engine.best_move('DFS') == threats.bit_length() - 1
+            assert engine.best_move('Bidirectional') == (threats & -threats).bit_length() - 1
+
+
+# This function checks that move is a legal move of the engine's position, and that the principal variation starts with it
+# and can be played from the position.
+def assert_legal_line(engine, move, line):
+    assert move in engine.empty_cells()
+    assert not line or line[0] == move
+    for cell in line:
+        assert engine.is_empty(cell)
+        engine.place(cell)
+        engine.switch_player()
+
+
+# iddfs must stop within its node budget and still answer with the move of its last completed iteration.
+@pytest.mark.parametrize('node_limit', [1, 100, 5000])
+def test_iddfs_node_budget(node_limit):
+    engine = Engine(geometry=get_geometry(4, 4, 4))
+    move = engine.iddfs(node_limit=node_limit)
+    assert engine.nodes <= node_limit
+    assert_legal_line(engine, move, list(engine.principal_variation))
+
+
+def test_iddfs_time_budget():
+    engine = Engine(geometry=get_geometry(4, 4, 4))
+    start = time.perf_counter()
+    move = engine.iddfs(time_limit=0.05)
+    # The clock is read every BUDGET_CHECK_INTERVAL nodes, so the search overshoots its budget by a fraction of a second at most.
+    assert time.perf_counter() - start < 1.0
+    assert engine.principal_variation
+    assert_legal_line(engine, move, list(engine.principal_variation))
+    # The budget is dropped when the search ends, so the next search of the engine runs without it.
+    assert engine._next_check == float('inf')
+
+
+# A budget big enough for the whole game changes nothing: iddfs finds the same move as without a budget.
+def test_iddfs_budget_large_enough_matches_unlimited_search():
+    for board, player in reachable_positions()[::40]:
+        unlimited = Engine(board, player).best_move('IDDFS')
+        engine = Engine(board, player)
+        engine.node_limit = 100 * BUDGET_CHECK_INTERVAL
+        assert engine.best_move('IDDFS') == unlimited, (board, player)
+
+
+# An instrumented engine must pick the same moves as a plain one, and record every move with the nodes its search visited.
+@pytest.mark.parametrize('algorithm', ['BFS', 'DFS', 'Bidirectional', 'UCS', 'DLS', 'IDDFS'])
+def test_instrumentation_records_every_move(algorithm):
+    board = 'X   O  X '
+    plain = Engine(board, 'O')
+    plain.rng = random.Random(0)
+    expected = plain.best_move(algorithm)
+    Engine.table.clear()
+
+    records = []
+    trace = io.StringIO()
+    engine = Engine(board, 'O')
+    engine.rng = random.Random(0)
+    stats = engine.instrument(callback=records.append, trace=trace)
+    move = engine.best_move(algorithm)
+    assert move == expected
+    assert records == stats.moves and len(records) == 1
+    record = records[0]
+    assert record['algorithm'] == algorithm and record['player'] == 'O' and record['move'] == move
+    assert record['nodes'] == engine.nodes > 0
+    assert record['max_depth'] >= 1 and record['seconds'] >= 0
+    assert json.loads(trace.getvalue()) == record
+
+    # Switching the instrumentation off removes the wrappers again.
+    engine.uninstrument()
+    assert engine.stats is None and 'best_move' not in engine.__dict__
+
+
+# After request_stop, the searches raise SearchAborted at their next node, except iddfs, which answers with its best move so far.
+@pytest.mark.parametrize('algorithm', ['UCS', 'DLS', 'MCTS'])
+def test_stopped_engine_aborts_its_searches(algorithm):
+    engine = Engine(geometry=get_geometry(4, 4, 3))
+    engine.request_stop()
+    with pytest.raises(SearchAborted):
+        engine.best_move(algorithm)
+
+
+def test_stop_from_another_thread_ends_iddfs():
+    # Without a budget, iddfs would search 4 x 4 with k = 4 for far longer than the test waits.
+    engine = Engine(geometry=get_geometry(4, 4, 4))
+    moves = []
+    thread = threading.Thread(target=lambda: moves.append(engine.best_move('IDDFS')))
+    thread.start()
+    time.sleep(0.05)
+    engine.request_stop()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert moves and moves[0] in engine.empty_cells()
+    # The moves of the interrupted iteration were taken back.
+    assert not engine.move_stack and engine.empty_count == engine.geometry.cells
+
+
+# MCTS must play a legal move in every position, spending exactly its playout budget.
+@pytest.mark.parametrize('shape', SHAPES)
+def test_mcts_plays_legal_moves(shape):
+    geometry = get_geometry(*shape)
+    for x_bits, o_bits in random_positions(geometry, 20, seed=5):
+        if geometry.wins(x_bits) or geometry.wins(o_bits) or x_bits | o_bits == geometry.full_mask:
+            continue
+        player = 'X' if bin(x_bits).count('1') == bin(o_bits).count('1') else 'O'
+        engine = Engine(board_of(geometry, x_bits, o_bits), player, geometry)
+        engine.mcts_iterations = 100
+        move = engine.best_move('MCTS')
+        assert move in engine.empty_cells()
+        assert engine.playouts == engine.nodes == 100
+
+
+def test_mcts_takes_an_immediate_win_and_is_reproducible():
+    # 'O' wins on cell 2, and would otherwise have to block 'X' on cell 5.
+    moves = set()
+    for _ in range(2):
+        engine = Engine('OO XX    ', 'O')
+        engine.rng = random.Random(7)
+        engine.mcts_iterations = 500
+        moves.add(engine.best_move('MCTS'))
+    assert moves == {2}
+
+
+def random_games(n, seed):
+    rng = random.Random(seed)
+    players = gamelog.ALGORITHM_IDS + (gamelog.HUMAN,)
+    return [gamelog.GameRecord(tuple(rng.sample(range(9), rng.randint(0, 9))), rng.choice(players),
+                               rng.choice(players), rng.choice(gamelog.RESULTS)) for _ in range(n)]
+
+
+# Every game must survive encoding, and a log must read back the games written to it, across several writers and chunks.
+def test_game_log_round_trip(tmp_path):
+    games = random_games(500, seed=6)
+    for game in games:
+        assert gamelog.decode_record(gamelog.encode_game(*game)) == game
+    path = tmp_path / 'games.log'
+    with gamelog.RecordWriter(path, buffer_size=7) as writer:
+        writer.extend(games[:300])
+    with gamelog.RecordWriter(path, buffer_size=64) as writer:
+        for game in games[300:]:
+            writer.append(*game)
+    assert gamelog.count_records(path) == len(games)
+    assert list(gamelog.read_records(path, chunk_size=33)) == games
+
+
+def test_game_log_rejects_bad_input(tmp_path):
+    with pytest.raises(ValueError):
+        gamelog.encode_game((0, 9), 'BFS', 'DFS', 'X')
+    with pytest.raises(ValueError):
+        gamelog.encode_game(tuple(range(9)) + (0,), 'BFS', 'DFS', 'X')
+    with pytest.raises(ValueError):
+        gamelog.encode_game((0, 1), 'BFS', 'DFS', 'Y')
+    with pytest.raises(ValueError):
+        gamelog.encode_game((0, 1), 'BFS', 'Minimax', 'X')
+    other = tmp_path / 'other.log'
+    other.write_bytes(b'not a game log at all')
+    with pytest.raises(ValueError):
+        list(gamelog.read_records(other))
+    with pytest.raises(ValueError):
+        gamelog.RecordWriter(other)
+    truncated = tmp_path / 'truncated.log'
+    with gamelog.RecordWriter(truncated) as writer:
+        writer.extend(random_games(3, seed=7))
+    with open(truncated, 'ab') as f:
+        f.write(b'\0\0\0')
+    with pytest.raises(ValueError):
+        list(gamelog.read_records(truncated))
+
+
+# analyze must score every legal move exactly (1 a win, 0 a draw, -1 a loss for the player to move), best move first,
+# and give each move a principal variation that starts with it and can be played out.
+def test_analyze_scores_and_lines():
+    memo = {}
+    for board, player in reachable_positions()[::37]:
+        engine = Engine(board, player)
+        analysis = engine.analyze()
+        mover_bits, other_bits = engine.bits[player], engine.bits['O' if player == 'X' else 'X']
+        expected = {}
+        for move in STANDARD.empty_cells(mover_bits | other_bits):
+            new_bits = mover_bits | 1 << move
+            expected[move] = 1 if STANDARD.wins_through(new_bits, move) else -negamax(STANDARD, other_bits, new_bits, memo)
+        assert {entry.move: entry.score for entry in analysis} == expected
+        assert analysis == sorted(analysis, key=lambda entry: (-entry.score, entry.move))
+        for entry in analysis:
+            assert entry.principal_variation
+            assert_legal_line(Engine(board, player), entry.move, entry.principal_variation)
+    with pytest.raises(ValueError):
+        Engine().analyze(depth=0)
+
+
+# This function turns a mask of cells into the list of booleans of every cell, like the rows batch returns.
+def cell_flags(mask):
+    return [bool(mask >> cell & 1) for cell in range(9)]
+
+
+# evaluate_batch must agree with the engine on every position: the winner, whether the game is over, the winning and
+# blocking cells of 'O', and the move of the one-ply algorithms whenever they do not fall back to a random move.
+@pytest.mark.parametrize('algorithm', ['BFS', 'DFS', 'Bidirectional'])
+def test_batch_matches_engine(algorithm):
+    batch = pytest.importorskip('batch')
+    boards = [board_of(STANDARD, x_bits, o_bits) for x_bits, o_bits in random_positions(STANDARD, 300, seed=8)]
+    boards += [board for board, player in reachable_positions() if player == 'O']
+    result = batch.evaluate_batch(batch.encode_boards(boards), algorithm, batch.O, seed=0)
+    for i, board in enumerate(boards):
+        engine = Engine(board, 'O')
+        winner = engine.winner_after()
+        assert result.winner[i] == {None: batch.EMPTY, 'X': batch.X, 'O': batch.O}[winner]
+        assert result.terminal[i] == (winner is not None or ' ' not in board)
+        if result.terminal[i]:
+            continue
+        wins, blocks = engine.winning_cells('O'), engine.winning_cells('X')
+        assert list(result.winning_moves[i]) == cell_flags(wins)
+        assert list(result.blocking_moves[i]) == cell_flags(blocks)
+        if wins or blocks:
+            assert result.heuristic_move[i] == engine.best_move(algorithm)
+        else:
+            assert board[result.heuristic_move[i]] == ' '
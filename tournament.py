@@ -0,0 +1,183 @@
+# Copyright (C) Muhammad Essam Abelaziz | Saturday 28 October
+#
+# If you intend to use, modify, or redistribute this code for educational purposes, you are required to
+# provide attribution by prominently displaying the following information in your project:
+#
+# Original code by Muhammad Essam Abdelaziz
+# git@github.com:Coderation/Tic-Tac-Toe-Project-with-6-Uniform-Search-Methods-for-ILLUSTRATIVE-PURPOSES.git
+
+#_________________________________________________________________________________________________________#
+
+# This module runs a self-play tournament between the AI algorithms from the command line.
+# Every algorithm plays every other algorithm N times as 'X' and N times as 'O'. The games are spread across a
+# process pool, and every game has its own seed for the random fallback moves, so a tournament can be replayed exactly.
+# At the end it prints the win/draw/loss table, the number of games per second and the move latency of every algorithm.
+#
+# Example:
+#     python tournament.py --games 100 --workers 4 --seed 1
+import argparse
+import itertools
+import json
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import ALGORITHMS, Engine
+
+# PERCENTILES are the move latency percentiles reported for every algorithm.
+PERCENTILES = (50, 90, 99)
+
+
+# This function plays one game between x_algorithm (moving first as 'X') and o_algorithm.
+# It returns the result ('X', 'O' or 'draw'), the time, in seconds, each side took for each of its moves,
+# and the list of moves played ('X' first).
+def play_game(x_algorithm, o_algorithm, seed):
+    engine = Engine()
+    # The engine gets its own random generator, so the random fallback moves of this game depend only on its seed.
+    engine.rng = random.Random(seed)
+    latencies = {'X': [], 'O': []}
+    moves = []
+    result = None
+    while result is None:
+        player = engine.current_player
+        algorithm = x_algorithm if player == 'X' else o_algorithm
+        start = time.perf_counter()
+        move = engine.best_move(algorithm)
+        latencies[player].append(time.perf_counter() - start)
+        moves.append(move)
+        result = engine.play(move)
+    return result, latencies, moves
+
+
+# This function plays a batch of games between the same two algorithms, one per seed. It is what each pool worker runs.
+# Batches keep the number of tasks (and so the cost of sending them between processes) small.
+def play_games(x_algorithm, o_algorithm, seeds):
+    results = []
+    latencies = {x_algorithm: [], o_algorithm: []}
+    for seed in seeds:
+        result, game_latencies, _ = play_game(x_algorithm, o_algorithm, seed)
+        results.append(result)
+        latencies[x_algorithm].extend(game_latencies['X'])
+        latencies[o_algorithm].extend(game_latencies['O'])
+    return x_algorithm, o_algorithm, results, latencies
+
+
+# This function returns the p-th percentile of a sorted list of numbers (nearest-rank method).
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p * len(sorted_values) / 100))
+    return sorted_values[rank - 1]
+
+
+# This function runs the whole tournament and returns a summary dictionary.
+#   algorithms   the AI option names taking part (every one in ALGORITHMS by default)
+#   games        the number of games played for every ordered pairing, so each pair meets 2 * games times
+#   workers      the number of worker processes (None lets the pool use one per CPU)
+#   seed         the tournament seed; the seed of every game is derived from it
+#   batch_size   the number of games sent to a worker at once
+def run_tournament(algorithms=None, games=10, workers=None, seed=0, batch_size=25):
+    algorithms = list(algorithms or ALGORITHMS)
+    for algorithm in algorithms:
+        if algorithm not in ALGORITHMS:
+            raise ValueError("Unknown AI algorithm: " + str(algorithm))
+    # A Random seeded with the tournament seed hands out one seed per game, in a fixed order,
+    # so the same tournament seed always gives the same games, whatever the number of workers.
+    seeder = random.Random(seed)
+    tasks = []
+    for x_algorithm, o_algorithm in itertools.permutations(algorithms, 2):
+        seeds = [seeder.getrandbits(64) for _ in range(games)]
+        for start in range(0, games, batch_size):
+            tasks.append((x_algorithm, o_algorithm, seeds[start:start + batch_size]))
+
+    # table[a][b] counts the wins, draws and losses of algorithm a against algorithm b, over both colours.
+    table = {a: {b: {'win': 0, 'draw': 0, 'loss': 0} for b in algorithms if b != a} for a in algorithms}
+    latencies = {algorithm: [] for algorithm in algorithms}
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(play_games, *task) for task in tasks]
+        for future in futures:
+            x_algorithm, o_algorithm, results, batch_latencies = future.result()
+            for result in results:
+                if result == 'draw':
+                    table[x_algorithm][o_algorithm]['draw'] += 1
+                    table[o_algorithm][x_algorithm]['draw'] += 1
+                else:
+                    winner, loser = (x_algorithm, o_algorithm) if result == 'X' else (o_algorithm, x_algorithm)
+                    table[winner][loser]['win'] += 1
+                    table[loser][winner]['loss'] += 1
+            for algorithm, values in batch_latencies.items():
+                latencies[algorithm].extend(values)
+    elapsed = time.perf_counter() - start
+
+    total_games = games * len(algorithms) * (len(algorithms) - 1)
+    latency_summary = {}
+    for algorithm, values in latencies.items():
+        values.sort()
+        summary = {'moves': len(values)}
+        # Latencies are reported in microseconds.
+        for p in PERCENTILES:
+            summary['p' + str(p)] = percentile(values, p) * 1e6
+        summary['max'] = values[-1] * 1e6 if values else 0.0
+        latency_summary[algorithm] = summary
+    return {
+        'seed': seed,
+        'games': total_games,
+        'seconds': elapsed,
+        'games_per_second': total_games / elapsed if elapsed else 0.0,
+        'table': table,
+        'latency_us': latency_summary,
+    }
+
+
+# This function prints a tournament summary as plain text tables.
+def print_summary(summary):
+    algorithms = list(summary['table'])
+    width = max(len(algorithm) for algorithm in algorithms) + 2
+    cell = 14
+
+    print("Win/draw/loss of each row algorithm against each column algorithm (both colours):")
+    print(''.ljust(width) + ''.join(b.rjust(cell) for b in algorithms) + 'total'.rjust(cell))
+    for a in algorithms:
+        row = a.ljust(width)
+        totals = {'win': 0, 'draw': 0, 'loss': 0}
+        for b in algorithms:
+            if a == b:
+                row += '-'.rjust(cell)
+                continue
+            counts = summary['table'][a][b]
+            row += '{win}/{draw}/{loss}'.format(**counts).rjust(cell)
+            for key in totals:
+                totals[key] += counts[key]
+        row += '{win}/{draw}/{loss}'.format(**totals).rjust(cell)
+        print(row)
+
+    print()
+    print("{games} games in {seconds:.2f} s ({games_per_second:.1f} games/s)".format(**summary))
+    print()
+    print("Move latency in microseconds:")
+    columns = ['moves'] + ['p' + str(p) for p in PERCENTILES] + ['max']
+    print(''.ljust(width) + ''.join(column.rjust(cell) for column in columns))
+    for algorithm in algorithms:
+        stats = summary['latency_us'][algorithm]
+        print(algorithm.ljust(width) + str(stats['moves']).rjust(cell)
+              + ''.join('{:.1f}'.format(stats[column]).rjust(cell) for column in columns[1:]))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play every AI algorithm against every other one.")
+    parser.add_argument('--games', type=int, default=10, help="games per pairing and colour (default: %(default)s)")
+    parser.add_argument('--algorithms', nargs='+', default=list(ALGORITHMS), choices=list(ALGORITHMS),
+                        help="algorithms taking part (default: all of them)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument('--seed', type=int, default=0, help="tournament seed (default: %(default)s)")
+    parser.add_argument('--batch-size', type=int, default=25, help="games per worker task (default: %(default)s)")
+    parser.add_argument('--json', metavar='PATH', help="also write the summary as JSON to PATH")
+    args = parser.parse_args()
+
+    summary = run_tournament(args.algorithms, args.games, args.workers, args.seed, args.batch_size)
+    print_summary(summary)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(summary, f, indent=2)
@@ -0,0 +1,116 @@
+# Copyright (C) Muhammad Essam Abelaziz | Saturday 28 October
+#
+# If you intend to use, modify, or redistribute this code for educational purposes, you are required to
+# provide attribution by prominently displaying the following information in your project:
+#
+# Original code by Muhammad Essam Abdelaziz
+# git@github.com:Coderation/Tic-Tac-Toe-Project-with-6-Uniform-Search-Methods-for-ILLUSTRATIVE-PURPOSES.git
+
+#_________________________________________________________________________________________________________#
+
+# This module holds the transposition table shared by the minimax searches.
+# A transposition table remembers the result of every position the searches have already solved,
+# so the same position reached through a different move order (or in a later move, or a later game) is not searched again.
+# Positions that are rotations or reflections of each other have the same value, so they are folded onto one canonical key:
+# the smallest of the Zobrist hashes of the symmetric copies of the position.
+# The symmetries and the Zobrist keys come from the Geometry of the board (see geometry.py).
+# The searches keep those hashes up to date move by move (see Engine.make_move) and call probe and save with them;
+# lookup and store compute them from the bitboards, for callers that do not have them.
+# A table can be used by several threads at once (the server can search in a thread pool), so every change is made under its lock.
+import threading
+from collections import OrderedDict
+
+from geometry import STANDARD
+
+
+# This class is the transposition table itself.
+# Every entry maps a canonical hash (plus a context tuple, for example the search that produced it and the side to move)
+# to the value of that position and the best move, stored in the canonical orientation.
+# Positions of different board geometries are kept apart, because the same bitboards mean different boards.
+class TranspositionTable:
+    # EVICTION_POLICIES are the ways an entry can be chosen for removal once the table is full.
+    # 'lru' removes the entry that was used least recently, 'fifo' removes the entry that was stored first.
+    EVICTION_POLICIES = ('lru', 'fifo')
+
+    def __init__(self, max_entries=1 << 16, eviction='lru'):
+        # If the eviction policy is unknown, it raises a ValueError, just like make_pc_move does for an unknown AI option.
+        if eviction not in self.EVICTION_POLICIES:
+            raise ValueError("Unknown eviction policy: " + str(eviction))
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.eviction = eviction
+        # entries is an OrderedDict so the oldest (or least recently used) entry is always at the front.
+        self.entries = OrderedDict()
+        # lock guards entries and the counters: a lookup moves its entry while another thread may be evicting or clearing.
+        self.lock = threading.Lock()
+        # These counters let callers see how well the table is working.
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    # This function looks up a position. It returns a (value, best_move) tuple, or None if the position is not stored.
+    # The best move is turned back into the orientation of the board that was passed in.
+    def lookup(self, x_bits, o_bits, context=(), geometry=STANDARD):
+        key, symmetry = geometry.canonical_hash(x_bits, o_bits)
+        return self.probe(key, symmetry, context, geometry)
+
+    # This function is lookup for a position whose canonical hash and symmetry are already known.
+    def probe(self, key, symmetry, context=(), geometry=STANDARD):
+        key = (key, geometry, context)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            # With the 'lru' policy, a hit moves the entry to the back so it is the last one to be evicted.
+            if self.eviction == 'lru':
+                self.entries.move_to_end(key)
+        value, best_move = entry
+        if best_move is not None:
+            best_move = geometry.inverse_symmetries[symmetry][best_move]
+        return value, best_move
+
+    # This function stores the value and best move of a position.
+    # The best move is turned into the canonical orientation first, so every symmetric copy of the position can use it.
+    def store(self, x_bits, o_bits, value, best_move=None, context=(), geometry=STANDARD):
+        key, symmetry = geometry.canonical_hash(x_bits, o_bits)
+        self.save(key, symmetry, value, best_move, context, geometry)
+
+    # This function is store for a position whose canonical hash and symmetry are already known.
+    def save(self, key, symmetry, value, best_move=None, context=(), geometry=STANDARD):
+        if best_move is not None:
+            best_move = geometry.symmetries[symmetry][best_move]
+        with self.lock:
+            self.entries[(key, geometry, context)] = (value, best_move)
+            # If the table has grown past its size limit, the entry at the front of the OrderedDict is removed.
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    # This function changes the size limit, evicting entries straight away if the table is now too big.
+    def resize(self, max_entries):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        with self.lock:
+            self.max_entries = max_entries
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    # This function empties the table and resets its counters.
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+# SHARED_TABLE is the table used by the searches by default.
+# It lives at module level, so everything it learns is kept across moves and across games for as long as the process runs.
+SHARED_TABLE = TranspositionTable()